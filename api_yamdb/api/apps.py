@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.conf import settings
+        from django.core.signals import request_started
+
+        from . import signals  # noqa: F401
+        from .v1.autocomplete import autocomplete
+
+        # Индексы подсказок строятся не здесь: ready() вызывается и для
+        # команд вроде migrate, когда таблиц может ещё не быть.
+        if settings.AUTOCOMPLETE_WARM_UP:
+            request_started.connect(autocomplete.warm_up)
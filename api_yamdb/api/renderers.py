@@ -0,0 +1,99 @@
+import csv
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Ответ совпадает с JSONRenderer побайтно: даты и прочие типы
+    не из JSON передаются в encoder_class DRF. Отступы, нестандартные
+    настройки JSON и всё, что orjson не умеет (целые больше 64 бит,
+    нестроковые ключи), рендерятся стандартным JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii
+            or not self.compact or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer, экранирует U+2028 и U+2029.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace(
+            '\u2029'.encode(), b'\\u2029'
+        )
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Построчный JSON: один объект на строку.
+
+    stream() отдаёт строки по одной для StreamingHttpResponse.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b''.join(self.stream([data], ()))
+
+    def stream(self, rows, fields):
+        renderer = FastJSONRenderer()
+        for row in rows:
+            yield renderer.render(row) + b'\n'
+
+
+class Echo:
+    """Файлоподобный объект, который возвращает записанное."""
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV с заголовком из списка полей.
+
+    Вложенные объекты записываются своим slug, списки объектов — slug
+    через пробел, None — пустой строкой.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b''.join(self.stream([data], tuple(data)))
+
+    @classmethod
+    def flatten(cls, value):
+        if value is None:
+            return ''
+        if isinstance(value, dict):
+            return value.get('slug', '')
+        if isinstance(value, list):
+            return ' '.join(cls.flatten(item) for item in value)
+        return value
+
+    def stream(self, rows, fields):
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields).encode(self.charset)
+        for row in rows:
+            yield writer.writerow(
+                [self.flatten(row.get(field)) for field in fields]
+            ).encode(self.charset)
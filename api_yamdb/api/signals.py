@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.v1.autocomplete import autocomplete
+from api.v1.cache import invalidate_list_cache
+from reviews.models import Category, Genre, Title
+from reviews.ratings import rating_changed
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_cached_lists(sender, **kwargs):
+    # До фиксации параллельный запрос ещё видит старые строки и сохранил
+    # бы их под новой версией.
+    transaction.on_commit(lambda: invalidate_list_cache(sender))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_facets(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_list_cache(Title))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Title)
+def index_autocomplete(sender, instance, **kwargs):
+    autocomplete.save(sender, instance)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+def unindex_autocomplete(sender, instance, **kwargs):
+    autocomplete.delete(sender, instance.pk)
+
+
+@receiver(rating_changed)
+def update_autocomplete_rating(sender, title_id, score_delta, count_delta,
+                               **kwargs):
+    autocomplete.change_rating(title_id, score_delta, count_delta)
@@ -0,0 +1,281 @@
+import bisect
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connection
+
+from reviews.models import Category, Genre, Title
+from reviews.search import TOKEN_RE, normalize
+
+MAX_PREFIX_LEN = 10
+
+
+class PrefixTrigramIndex:
+    """Индекс названий в памяти для подсказок при наборе.
+
+    Для каждого префикса слова (до MAX_PREFIX_LEN букв) и каждой
+    триграммы названия хранится список записей, упорядоченный по
+    убыванию оценки, затем по названию. Поиск читает самый короткий из
+    списков слов запроса с начала и останавливается на limit
+    подходящих записях; если по префиксам их меньше, добирает записи,
+    содержащие запрос подстрокой, по самой редкой его триграмме.
+    Смена оценки переставляет запись во всех её списках.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._postings = {}
+
+    @staticmethod
+    def trigrams(text):
+        return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+    @classmethod
+    def terms(cls, text, words):
+        terms = {
+            'p' + word[:length]
+            for word in words
+            for length in range(1, min(len(word), MAX_PREFIX_LEN) + 1)
+        }
+        return terms | {'t' + trigram for trigram in cls.trigrams(text)}
+
+    @staticmethod
+    def order(key, text, score):
+        return (-score if score is not None else float('inf'), text, key)
+
+    def _entry(self, key, name, payload, score):
+        text = normalize(name)
+        words = tuple(set(TOKEN_RE.findall(text)))
+        return [text, words, payload, self.order(key, text, score)]
+
+    def build(self, items):
+        """Заполняет индекс четвёрками (ключ, название, данные, оценка)."""
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            for key, name, payload, score in items:
+                entry = self._entry(key, name, payload, score)
+                self._entries[key] = entry
+                for term in self.terms(entry[0], entry[1]):
+                    self._postings.setdefault(term, []).append(entry[3])
+            for posting in self._postings.values():
+                posting.sort()
+
+    def _insert(self, entry):
+        for term in self.terms(entry[0], entry[1]):
+            bisect.insort(self._postings.setdefault(term, []), entry[3])
+
+    def _remove(self, entry):
+        for term in self.terms(entry[0], entry[1]):
+            posting = self._postings[term]
+            del posting[bisect.bisect_left(posting, entry[3])]
+            if not posting:
+                del self._postings[term]
+
+    def add(self, key, name, payload, score):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._remove(old)
+            entry = self._entry(key, name, payload, score)
+            self._entries[key] = entry
+            self._insert(entry)
+
+    def update(self, key, score, **payload):
+        """Меняет оценку и данные записи, не меняя название."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._remove(entry)
+            entry[2] = {**entry[2], **payload}
+            entry[3] = self.order(key, entry[0], score)
+            self._insert(entry)
+
+    def remove(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._remove(entry)
+
+    def _prefix_matches(self, words, limit):
+        # Перебирается самый короткий из списков слов запроса, остальные
+        # слова проверяются по словам названия.
+        postings = [
+            (self._postings.get('p' + word[:MAX_PREFIX_LEN], ()), word)
+            for word in words
+        ]
+        posting, first = min(postings, key=lambda item: len(item[0]))
+        others = [word for word in words if word is not first]
+        if len(first) > MAX_PREFIX_LEN:
+            others.append(first)
+        keys = []
+        for _, _, key in posting:
+            entry_words = self._entries[key][1]
+            if all(
+                any(entry_word.startswith(word) for entry_word in entry_words)
+                for word in others
+            ):
+                keys.append(key)
+                if len(keys) == limit:
+                    break
+        return keys
+
+    def _substring_matches(self, text, limit, exclude):
+        postings = [
+            self._postings.get('t' + trigram, ())
+            for trigram in self.trigrams(text)
+        ]
+        keys = []
+        for _, entry_text, key in min(postings, key=len):
+            if key not in exclude and text in entry_text:
+                keys.append(key)
+                if len(keys) == limit:
+                    break
+        return keys
+
+    def search(self, query, limit):
+        text = normalize(query).strip()
+        words = TOKEN_RE.findall(text)
+        if not words:
+            return []
+        with self._lock:
+            keys = self._prefix_matches(words, limit)
+            if len(keys) < limit and len(text) >= 3:
+                keys += self._substring_matches(
+                    text, limit - len(keys), set(keys)
+                )
+            return [self._entries[key][2] for key in keys]
+
+
+def title_item(pk, name, score_sum, reviews_count):
+    rating = score_sum / reviews_count if reviews_count else None
+    return pk, name, {
+        'id': pk,
+        'name': name,
+        'rating': int(rating) if rating is not None else None,
+    }, rating
+
+
+def slug_item(pk, name, slug):
+    return pk, name, {'name': name, 'slug': slug}, None
+
+
+class Autocomplete:
+    """Индексы подсказок для произведений, жанров и категорий.
+
+    Строятся в фоне при первом запросе к процессу (без
+    AUTOCOMPLETE_WARM_UP — при первом обращении) и поддерживаются
+    сигналами сохранения и удаления. Изменения из других процессов (другие
+    воркеры, loadcsv) подхватываются полной перестройкой в фоне раз в
+    AUTOCOMPLETE_REBUILD_INTERVAL секунд.
+    """
+
+    sources = {
+        'titles': (
+            Title, ('id', 'name', 'score_sum', 'reviews_count'), title_item
+        ),
+        'genres': (Genre, ('id', 'name', 'slug'), slug_item),
+        'categories': (Category, ('id', 'name', 'slug'), slug_item),
+    }
+
+    def __init__(self):
+        self._indexes = None
+        self._ratings = {}
+        self._built = 0
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def build(self):
+        indexes, ratings = {}, {}
+        for kind, (model, fields, make_item) in self.sources.items():
+            rows = model.objects.values_list(*fields)
+            if model is Title:
+                rows = list(rows)
+                ratings = {row[0]: [row[2], row[3]] for row in rows}
+            index = PrefixTrigramIndex()
+            index.build(make_item(*row) for row in rows)
+            indexes[kind] = index
+        self._indexes, self._ratings = indexes, ratings
+        self._built = time.monotonic()
+
+    def _rebuild_in_background(self):
+        try:
+            self.build()
+        finally:
+            self._rebuilding = False
+            connection.close()
+
+    def _warm_up(self):
+        try:
+            with self._lock:
+                if self._indexes is None:
+                    self.build()
+        finally:
+            connection.close()
+
+    def warm_up(self, **kwargs):
+        """Строит индексы в фоне при первом запросе к процессу."""
+        request_started.disconnect(self.warm_up)
+        if self._indexes is None:
+            threading.Thread(target=self._warm_up, daemon=True).start()
+
+    def get_indexes(self):
+        if self._indexes is None:
+            with self._lock:
+                if self._indexes is None:
+                    self.build()
+        elif (
+            not self._rebuilding
+            and time.monotonic() - self._built
+            > settings.AUTOCOMPLETE_REBUILD_INTERVAL
+        ):
+            self._rebuilding = True
+            threading.Thread(
+                target=self._rebuild_in_background, daemon=True
+            ).start()
+        return self._indexes
+
+    def search(self, query, kinds, limit):
+        indexes = self.get_indexes()
+        return {kind: indexes[kind].search(query, limit) for kind in kinds}
+
+    def save(self, model, instance):
+        if self._indexes is None:
+            return
+        for kind, (source, fields, make_item) in self.sources.items():
+            if source is model:
+                values = [getattr(instance, field) for field in fields]
+                if model is Title:
+                    self._ratings[instance.pk] = values[2:]
+                self._indexes[kind].add(*make_item(*values))
+
+    def delete(self, model, pk):
+        if self._indexes is None:
+            return
+        for kind, (source, _, _) in self.sources.items():
+            if source is model:
+                self._indexes[kind].remove(pk)
+        if model is Title:
+            self._ratings.pop(pk, None)
+
+    def change_rating(self, title_id, score_delta, count_delta):
+        if self._indexes is None or title_id not in self._ratings:
+            return
+        parts = self._ratings[title_id]
+        parts[0] += score_delta
+        parts[1] += count_delta
+        _, _, payload, rating = title_item(title_id, None, *parts)
+        self._indexes['titles'].update(
+            title_id, rating, rating=payload['rating']
+        )
+
+    def clear(self):
+        self._indexes = None
+        self._ratings = {}
+
+
+autocomplete = Autocomplete()
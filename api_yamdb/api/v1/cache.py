@@ -0,0 +1,53 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def version_key(model):
+    return f'list-version:{model._meta.label_lower}'
+
+
+def get_list_version(model):
+    """Текущая версия кэша списков модели.
+
+    Если ключ версии вытеснен из кэша, создаётся новая версия, и старые
+    записи просто перестают читаться.
+    """
+    key = version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_list_cache(model):
+    cache.set(version_key(model), time.time_ns(), None)
+
+
+def list_cache_key(model, full_path):
+    """Ключ ответа со списком для строки запроса.
+
+    Ключ вычисляется один раз на запрос: если модель изменится, пока
+    ответ собирается, он сохранится под старой версией и не будет прочитан.
+    """
+    digest = hashlib.md5(full_path.encode()).hexdigest()
+    return (
+        f'list:{model._meta.label_lower}:{get_list_version(model)}:{digest}'
+    )
+
+
+def cache_timeout(timeout):
+    """Срок хранения кэшированного ответа.
+
+    LocMemCache у каждого процесса свой, и сброс версии в одном процессе
+    не виден остальным. Для него срок ограничен LOCAL_CACHE_TIMEOUT, чтобы
+    устаревший ответ жил недолго; общий кэш (Redis, memcached, файлы)
+    хранит ответ весь срок timeout.
+    """
+    if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache):
+        return min(timeout, settings.LOCAL_CACHE_TIMEOUT)
+    return timeout
@@ -0,0 +1,80 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from reviews.models import Category, Genre, Title
+from .cache import cache_timeout, get_list_version
+
+
+def related_counts(model, titles):
+    # Фильтр перед annotate: Count считает по тому же соединению.
+    return list(
+        model.objects.filter(titles__in=titles.values('pk'))
+        .values('slug', 'name')
+        .annotate(count=Count('titles'))
+        .order_by('-count', 'name')
+    )
+
+
+def genre_counts(titles):
+    return related_counts(Genre, titles)
+
+
+def category_counts(titles):
+    return related_counts(Category, titles)
+
+
+def year_counts(titles):
+    return list(
+        Title.objects.filter(pk__in=titles.values('pk'))
+        .values('year')
+        .annotate(count=Count('pk'))
+        .order_by('-count', '-year')
+    )
+
+
+FACETS = {
+    'genre': genre_counts,
+    'category': category_counts,
+    'year': year_counts,
+}
+
+
+def facet_cache_key(name, filters):
+    """Ключ счётчиков фасета для набора фильтров.
+
+    В ключ входят версии списков произведений, жанров и категорий:
+    любое их изменение делает старые счётчики недоступными. Другие
+    процессы видят новую версию только в общем кэше; с LocMemCache
+    счётчики просто хранятся недолго (см. cache_timeout).
+    """
+    digest = hashlib.md5(urlencode(filters).encode()).hexdigest()
+    versions = ':'.join(
+        str(get_list_version(model)) for model in (Title, Genre, Category)
+    )
+    return f'facets:{name}:{versions}:{digest}'
+
+
+def get_facets(titles, names, filters):
+    """Счётчики произведений по значениям фасетов.
+
+    titles — уже отфильтрованный queryset, filters — отсортированные
+    пары параметров фильтра, от которых он зависит. Посчитанные
+    счётчики берутся из кэша, GROUP BY выполняется только для
+    отсутствующих в нём фасетов.
+    """
+    keys = {name: facet_cache_key(name, filters) for name in names}
+    cached = cache.get_many(keys.values())
+    result = {}
+    for name, key in keys.items():
+        counts = cached.get(key)
+        if counts is None:
+            counts = FACETS[name](titles)
+            cache.set(
+                key, counts, cache_timeout(settings.FACETS_CACHE_TIMEOUT)
+            )
+        result[name] = counts
+    return result
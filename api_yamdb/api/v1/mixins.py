@@ -1,4 +1,22 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework import mixins, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import cache_timeout, list_cache_key
+from .facets import FACETS, get_facets
+from .serializers import ValuesListSerializer
+
+
+def latest(*dates):
+    """Наибольшая из дат без учёта None."""
+    return max((date for date in dates if date is not None), default=None)
 
 
 class CustomMixin(mixins.CreateModelMixin,
@@ -6,3 +24,246 @@ class CustomMixin(mixins.CreateModelMixin,
                   mixins.ListModelMixin,
                   viewsets.GenericViewSet):
     pass
+
+
+class CachedListMixin:
+    """Кэширует ответы list по полной строке запроса."""
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(self.queryset.model, request.get_full_path())
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(
+            key, response.data, cache_timeout(settings.LIST_CACHE_TIMEOUT)
+        )
+        return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 на GET, если с прошлого запроса ничего не менялось.
+
+    Валидаторы для списка по умолчанию считаются одним агрегатом по
+    отфильтрованному queryset: количество строк, наибольший id и
+    наибольшая дата изменения. Количество передаётся пагинатору вместо
+    COUNT(*), а страница не сериализуется, если клиент получит 304.
+
+    Last-Modified отдаётся, только если состояние содержит дату
+    last_modified, которая сдвигается при любом изменении ответа. Max по
+    дате изменения при удалении строки не растёт, поэтому списки по
+    умолчанию отдают только ETag, в котором учтено количество строк.
+    """
+
+    def get_etag_extra(self):
+        """Дополнительные данные для ETag, от которых зависит ответ."""
+        return ''
+
+    def get_validators(self, state):
+        values = ':'.join(f'{key}={state[key]}' for key in sorted(state))
+        tag = f'{values}:{self.get_etag_extra()}'
+        etag = quote_etag(hashlib.md5(tag.encode()).hexdigest())
+        last_modified = state.get('last_modified')
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        return etag, last_modified
+
+    def conditional_response(self, request, serialize, state):
+        etag, last_modified = self.get_validators(state)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = serialize()
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_list_state(self, queryset):
+        """Количество строк, наибольший id и дата изменения списка."""
+        return queryset.aggregate(
+            count=Count('pk'), last_id=Max('pk'), updated=Max('updated')
+        )
+
+    def get_object_state(self, instance):
+        """Состояние объекта; его дата изменения годится для Last-Modified."""
+        return {'last_id': instance.pk, 'last_modified': instance.updated}
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        state = self.get_list_state(queryset)
+
+        def serialize():
+            if self.paginator is not None:
+                self.paginator.count_hint = state['count']
+            return self.list_response(queryset)
+
+        return self.conditional_response(request, serialize, state)
+
+    def list_response(self, queryset):
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+
+        def serialize():
+            return Response(self.get_serializer(instance).data)
+
+        return self.conditional_response(
+            request, serialize, self.get_object_state(instance)
+        )
+
+
+class ValuesListMixin:
+    """Список на чтение собирается из .values() без объектов моделей.
+
+    Ответ совпадает с обычным сериализатором; запись и отдельные
+    объекты по-прежнему идут через него.
+    """
+
+    def list_response(self, queryset):
+        serializer = ValuesListSerializer(self.get_serializer())
+        rows = serializer.values(
+            queryset, *getattr(self.paginator, 'values_fields', ())
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(rows))
+
+
+class SparseFieldsMixin:
+    """Параметр ?fields=a,b для GET: только перечисленные поля.
+
+    Ненужные поля убираются из сериализатора, а вместе с ними из запроса
+    пропадают соединения select_related и prefetch_related по ним. В
+    списках с ValuesListMixin выбираются только нужные столбцы.
+    """
+
+    fields_query_param = 'fields'
+
+    def get_requested_fields(self):
+        if self.request.method != 'GET':
+            return None
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        fields = {name.strip() for name in value.split(',')} - {''}
+        return fields or None
+
+    def is_field_requested(self, name):
+        fields = self.get_requested_fields()
+        return fields is None or name in fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        select_related = queryset.query.select_related
+        joins = [
+            name for name in (
+                select_related if isinstance(select_related, dict) else ()
+            )
+            if name in fields
+        ]
+        prefetches = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if lookup in fields
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        return queryset.prefetch_related(*prefetches)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_requested_fields()
+        if fields is None:
+            return serializer
+        target = getattr(serializer, 'child', serializer)
+        unknown = fields - set(target.fields)
+        if unknown:
+            raise ValidationError({
+                self.fields_query_param: [
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+                ]
+            })
+        for name in set(target.fields) - fields:
+            target.fields.pop(name)
+        return serializer
+
+    def check_requested_fields(self):
+        """Проверяет ?fields= до условных заголовков.
+
+        Иначе неверный параметр вместе с актуальным If-None-Match дал бы
+        304 вместо ошибки 400.
+        """
+        if self.get_requested_fields() is not None:
+            self.get_serializer()
+
+    def list(self, request, *args, **kwargs):
+        self.check_requested_fields()
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        self.check_requested_fields()
+        return super().retrieve(request, *args, **kwargs)
+
+
+class FacetsMixin:
+    """Параметр ?facets=genre,category,year для списка.
+
+    К странице добавляется ключ facets со счётчиками произведений по
+    значениям каждого фасета среди отфильтрованных. Счётчики кэшируются
+    по параметрам фильтра, поэтому листание страниц и повторные запросы
+    не пересчитывают их, пока не изменятся произведения, жанры или
+    категории.
+    """
+
+    facets_query_param = 'facets'
+
+    def get_requested_facets(self):
+        value = self.request.query_params.get(self.facets_query_param)
+        if not value:
+            return ()
+        names = tuple(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        unknown = set(names) - set(FACETS)
+        if unknown:
+            raise ValidationError({
+                self.facets_query_param: [
+                    f'Неизвестные фасеты: {", ".join(sorted(unknown))}.'
+                ]
+            })
+        return names
+
+    def get_facet_filters(self):
+        """Параметры запроса, от которых зависит отфильтрованный список."""
+        params = self.request.query_params
+        return sorted(
+            (name, value)
+            for name in self.filterset_class.base_filters
+            for value in params.getlist(name)
+        )
+
+    def list(self, request, *args, **kwargs):
+        self.facets = self.get_requested_facets()
+        return super().list(request, *args, **kwargs)
+
+    def list_response(self, queryset):
+        response = super().list_response(queryset)
+        if self.facets:
+            response.data['facets'] = get_facets(
+                queryset, self.facets, self.get_facet_filters()
+            )
+        return response
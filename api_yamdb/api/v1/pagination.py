@@ -0,0 +1,155 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def seek(queryset, pub_date, pk, reverse=False):
+    """Строки после пары (pub_date, id) в порядке выдачи курсора.
+
+    Условие pub_date <= x вынесено отдельно от OR: тогда SQLite ищет по
+    составному индексу (родитель, pub_date) сразу с нужной позиции.
+    С одним лишь OR двух условий он берёт из индекса только родителя и
+    просматривает все строки до курсора.
+    """
+    lookup = 'gt' if reverse else 'lt'
+    return queryset.filter(
+        **{f'pub_date__{lookup}e': pub_date}
+    ).filter(
+        Q(**{f'pub_date__{lookup}': pub_date}) | Q(**{f'id__{lookup}': pk})
+    )
+
+
+class CountHintPagination(LimitOffsetPagination):
+    """limit/offset, которой можно передать уже посчитанное количество.
+
+    Если view заранее посчитал строки (например, для ETag), отдельный
+    COUNT(*) не выполняется.
+    """
+
+    count_hint = None
+
+    def get_count(self, queryset):
+        if self.count_hint is not None:
+            return self.count_hint
+        return super().get_count(queryset)
+
+
+class PubDateCursorPagination(CountHintPagination):
+    """Пагинация по ключу (pub_date, id) с запасным limit/offset.
+
+    Если в запросе есть параметр `cursor`, страница выбирается
+    условием по последней выданной паре (pub_date, id), без OFFSET и
+    COUNT(*). Пустой `cursor` означает первую страницу. Без параметра
+    работает обычная пагинация limit/offset.
+    """
+
+    cursor_query_param = 'cursor'
+    # Нужны в строках .values() для ссылок на соседние страницы.
+    values_fields = ('pub_date',)
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.use_cursor = False
+            return super().paginate_queryset(queryset, request, view)
+        self.use_cursor = True
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            ordering = ('pub_date', 'id')
+        else:
+            ordering = ('-pub_date', '-id')
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = seek(queryset, *position, reverse=reverse)
+
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def decode_cursor(self, request):
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None, False
+        try:
+            reverse, pub_date, pk = b64decode(
+                encoded.encode('ascii')
+            ).decode('ascii').split('|')
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (pub_date, pk), reverse == '1'
+
+    def encode_cursor(self, instance, reverse):
+        if isinstance(instance, dict):
+            pub_date, pk = instance['pub_date'], instance['id']
+        else:
+            pub_date, pk = instance.pub_date, instance.pk
+        cursor = '|'.join(
+            ('1' if reverse else '0', pub_date.isoformat(), str(pk))
+        )
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            b64encode(cursor.encode('ascii')).decode('ascii')
+        )
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict((
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        )))
+
+
+class SearchCursorPagination(CursorPagination):
+    """Курсор по rowid полнотекстового индекса, от новых к старым.
+
+    Страница читается из индекса подряд, без сортировки и COUNT(*),
+    поэтому её стоимость не зависит от числа совпадений.
+    """
+
+    ordering = '-search_id'
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    invalid_cursor_message = 'Некорректный курсор.'
@@ -10,6 +10,13 @@ class AdminOnly(permissions.BasePermission):
         return request.user.is_admin
 
 
+class ModerOrAdmin(permissions.BasePermission):
+    '''Доступно модератору и админу.'''
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_moderator or request.user.is_admin)
+
+
 class AdminOrReadOnly(permissions.BasePermission):
     '''Админ или только для чтения.'''
     def has_permission(self, request, view):
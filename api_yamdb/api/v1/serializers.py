@@ -1,7 +1,7 @@
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
 
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import highlight
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -29,7 +29,7 @@ class GETTitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('score_sum', 'reviews_count', 'updated')
 
 
 class TitleSerializer(serializers.ModelSerializer):
@@ -47,7 +47,7 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('score_sum', 'reviews_count', 'rating', 'updated')
 
     def to_representation(self, instance):
         """Определение сериалайзера."""
@@ -64,20 +64,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
-    def validate(self, data):
-        request = self.context['request']
-        if request.method == 'POST':
-            title_id = self.context['view'].kwargs['title_id']
-            author = self.context['request'].user
-            title = get_object_or_404(Title, pk=title_id)
-            if Review.objects.filter(title=title, author=author).exists():
-                raise serializers.ValidationError(
-                    'Можно оставить только один отзыв.'
-                )
-        return data
-
     class Meta:
-        fields = '__all__'
+        exclude = ('updated',)
         model = Review
 
 
@@ -92,5 +80,160 @@ class CommentSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated',)
+        model = Comment
+
+
+class CompactCommentSerializer(CommentSerializer):
+    """Комментарий со ссылкой на отзыв по id вместо его текста."""
+
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+
+
+class ReviewSearchSerializer(serializers.ModelSerializer):
+    """Найденный отзыв со сниппетом вокруг совпадений."""
+
+    author = serializers.SlugRelatedField(
+        slug_field='username',
+        read_only=True
+    )
+    snippet = serializers.SerializerMethodField()
+
+    class Meta:
+        fields = ('id', 'title', 'author', 'score', 'pub_date', 'snippet')
+        model = Review
+
+    def get_snippet(self, obj):
+        return highlight(obj.snippet)
+
+
+class CommentSearchSerializer(ReviewSearchSerializer):
+    """Найденный комментарий со сниппетом вокруг совпадений."""
+
+    class Meta:
+        fields = ('id', 'review', 'author', 'pub_date', 'snippet')
         model = Comment
+
+
+class ValuesListSerializer:
+    """Сериализация списка из строк .values() без объектов моделей.
+
+    Поля, их порядок и преобразования значений берутся из обычного
+    сериализатора, поэтому ответ совпадает с ним. Поддерживаются простые
+    поля, SlugRelatedField, PrimaryKeyRelatedField, вложенный сериализатор
+    по ForeignKey и вложенный many=True по ManyToManyField; последний
+    загружается одним запросом на страницу. Только для чтения.
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.pk = model._meta.pk.attname
+        self.lookups = [self.pk]
+        self.getters = []
+        self.related = []
+        for name, field in self.readable(serializer):
+            if isinstance(field, serializers.ListSerializer):
+                self.getters.append((name, self.many_getter(name)))
+                self.related.append(
+                    (name, model._meta.get_field(field.source), field.child)
+                )
+            elif isinstance(field, serializers.BaseSerializer):
+                self.getters.append((name, self.nested_getter(field)))
+            elif isinstance(field, serializers.SlugRelatedField):
+                self.getters.append((name, self.column_getter(
+                    f'{field.source}__{field.slug_field}'
+                )))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                self.getters.append((name, self.column_getter(field.source)))
+            elif isinstance(field, serializers.RelatedField):
+                raise TypeError(f'Поле {name} не поддерживается.')
+            else:
+                self.getters.append((name, self.column_getter(
+                    field.source, field.to_representation
+                )))
+
+    @staticmethod
+    def readable(serializer):
+        return [
+            (name, field) for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+
+    def column_getter(self, lookup, convert=None):
+        self.lookups.append(lookup)
+
+        def get(row):
+            value = row[lookup]
+            if value is None or convert is None:
+                return value
+            return convert(value)
+        return get
+
+    def nested_getter(self, field):
+        self.lookups.append(field.source)
+        getters = [
+            (name, self.column_getter(
+                f'{field.source}__{child.source}', child.to_representation
+            ))
+            for name, child in self.readable(field)
+        ]
+
+        def get(row):
+            if row[field.source] is None:
+                return None
+            return {name: get(row) for name, get in getters}
+        return get
+
+    def many_getter(self, name):
+        def get(row):
+            return self.prefetched[name].get(row[self.pk], [])
+        return get
+
+    def values(self, queryset, *extra):
+        return queryset.prefetch_related(None).values(
+            *dict.fromkeys((*self.lookups, *extra))
+        )
+
+    def prefetch(self, rows):
+        """Один запрос на каждое поле many=True для всей страницы."""
+        self.prefetched = {}
+        ids = [row[self.pk] for row in rows]
+        for name, model_field, child in self.related:
+            query_name = model_field.related_query_name()
+            getters = [
+                (child_name, child_field.source,
+                 child_field.to_representation)
+                for child_name, child_field in self.readable(child)
+            ]
+            related = {}
+            for row in model_field.related_model.objects.filter(
+                **{f'{query_name}__in': ids}
+            ).values(query_name, *(source for _, source, _ in getters)):
+                related.setdefault(row[query_name], []).append({
+                    child_name: convert(row[source])
+                    for child_name, source, convert in getters
+                })
+            self.prefetched[name] = related
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        if self.related:
+            self.prefetch(rows)
+        return [
+            {name: get(row) for name, get in self.getters} for row in rows
+        ]
+
+    def iterate(self, queryset, chunk_size):
+        """Все строки queryset частями по chunk_size в порядке ключа.
+
+        Каждая часть выбирается отдельным запросом от последнего ключа,
+        поэтому в памяти не больше одной части.
+        """
+        rows = self.values(queryset.order_by(self.pk))
+        chunk = list(rows[:chunk_size])
+        while chunk:
+            yield from self.to_representation(chunk)
+            chunk = list(
+                rows.filter(**{f'{self.pk}__gt': chunk[-1][self.pk]})
+                [:chunk_size]
+            )
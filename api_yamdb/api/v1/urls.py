@@ -1,10 +1,16 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (ReviewViewSet,
+from .views import (AutocompleteView,
+                    CommentSearchView,
+                    LeaderboardView,
+                    ReviewSearchView,
+                    ReviewViewSet,
+                    ReviewExportView,
                     CategoryViewSet,
                     GenreViewSet,
                     TitleViewSet,
+                    TitleExportView,
                     CommentViewSet)
 
 router_v1 = DefaultRouter()
@@ -24,5 +30,11 @@ router_v1.register(
 )
 
 urlpatterns = [
+    path('v1/autocomplete/', AutocompleteView.as_view()),
+    path('v1/leaderboards/<slug:board>/', LeaderboardView.as_view()),
+    path('v1/search/reviews/', ReviewSearchView.as_view()),
+    path('v1/search/comments/', CommentSearchView.as_view()),
+    path('v1/export/titles/', TitleExportView.as_view()),
+    path('v1/export/reviews/', ReviewExportView.as_view()),
     path('v1/', include(router_v1.urls)),
 ]
@@ -0,0 +1,14 @@
+from rest_framework.versioning import AcceptHeaderVersioning
+
+COMPACT_VERSION = '2'
+
+
+class CompactVersioning(AcceptHeaderVersioning):
+    """Версия ответа из заголовка Accept: application/json; version=2.
+
+    Во второй версии связанные объекты отдаются по id, а не полным
+    текстом; без заголовка ответ остаётся прежним.
+    """
+
+    default_version = '1'
+    allowed_versions = ('1', COMPACT_VERSION)
@@ -1,22 +1,61 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Subquery
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
+from rest_framework import generics, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import SearchFilter
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
-from reviews.models import Category, Genre, Review, Title
+from api.renderers import CSVRenderer, NDJSONRenderer
+
+from reviews.models import (Category, Comment, Genre, LeaderboardEntry,
+                            Review, Title)
+from reviews.search import build_query, search_texts
+from users.models import User
+from .autocomplete import autocomplete
 from .filters import TitleFilter
-from .mixins import CustomMixin
-from .permissions import AdminOrReadOnly, ModerOrAuthorOrReadOnly
+from .mixins import (CachedListMixin, ConditionalGetMixin, CustomMixin,
+                     FacetsMixin,
+                     SparseFieldsMixin, ValuesListMixin, latest)
+from .pagination import (CountHintPagination, PubDateCursorPagination,
+                         SearchCursorPagination)
+from .permissions import (AdminOnly, AdminOrReadOnly, ModerOrAdmin,
+                          ModerOrAuthorOrReadOnly)
 from .serializers import (CategorySerializer,
+                          CommentSearchSerializer,
                           CommentSerializer,
+                          CompactCommentSerializer,
                           GenreSerializer,
                           GETTitleSerializer,
+                          ReviewSearchSerializer,
                           ReviewSerializer,
-                          TitleSerializer)
+                          TitleSerializer,
+                          ValuesListSerializer)
+from .versioning import COMPACT_VERSION, CompactVersioning
+
+DUPLICATE_REVIEW = 'Можно оставить только один отзыв.'
+
+
+def users_updated():
+    """Подзапрос: последняя дата изменения пользователей.
 
+    Отзывы и комментарии показывают авторов по username. Искать
+    изменения только их авторов пришлось бы по всем строкам списка,
+    а наибольшая дата по индексу читается одной строкой; цена — сброс
+    валидаторов при изменении любого пользователя.
+    """
+    return Subquery(
+        User.objects.order_by('-updated').values('updated')[:1]
+    )
 
-class CategoryViewSet(CustomMixin):
+
+class CategoryViewSet(CachedListMixin, CustomMixin):
     """Вьюсет для категорий."""
 
     queryset = Category.objects.all()
@@ -27,7 +66,7 @@ class CategoryViewSet(CustomMixin):
     lookup_field = 'slug'
 
 
-class GenreViewSet(CustomMixin):
+class GenreViewSet(CachedListMixin, CustomMixin):
     """Вьюсет для жанров."""
 
     queryset = Genre.objects.all()
@@ -38,14 +77,69 @@ class GenreViewSet(CustomMixin):
     lookup_field = 'slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(FacetsMixin, SparseFieldsMixin, ValuesListMixin,
+                   ConditionalGetMixin, viewsets.ModelViewSet):
     """Вьюсет для произведений."""
 
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).all()
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     serializer_class = TitleSerializer
     permission_classes = (AdminOrReadOnly,)
+    pagination_class = CountHintPagination
+
+    def get_list_state(self, queryset):
+        """Состояние списка вместе с вложенными категориями и жанрами.
+
+        Их переименование или удаление не меняет строк произведений,
+        поэтому в ETag входят число ссылок на них и наибольшая дата их
+        изменения, если эти поля или фасеты по ним есть в ответе. Агрегат
+        считается по id отфильтрованных произведений: фильтр по жанру
+        иначе сузил бы соединение с жанрами.
+        """
+        fields = {
+            *(self.get_requested_fields() or {'category', 'genre'}),
+            *getattr(self, 'facets', ()),
+        }
+        related = {}
+        if 'category' in fields:
+            related.update(
+                categories=Count('category'),
+                categories_updated=Max('category__updated'),
+            )
+        if 'genre' in fields:
+            related.update(
+                genres=Count('genre'),
+                genres_updated=Max('genre__updated'),
+            )
+        if not related:
+            return super().get_list_state(queryset)
+        return Title.objects.filter(
+            pk__in=queryset.values('pk')
+        ).aggregate(
+            count=Count('pk', distinct=True),
+            last_id=Max('pk'),
+            updated=Max('updated'),
+            **related
+        )
+
+    def get_object_state(self, instance):
+        """Состояние произведения вместе с его категорией и жанрами.
+
+        Last-Modified не отдаётся: удаление жанра меняет ответ, но не
+        сдвигает ни одну дату изменения.
+        """
+        fields = self.get_requested_fields() or {'category', 'genre'}
+        state = {'last_id': instance.pk, 'updated': instance.updated}
+        if 'category' in fields and instance.category is not None:
+            state['category'] = instance.category.updated
+        if 'genre' in fields:
+            state['genres'] = sorted(
+                (genre.pk, genre.updated) for genre in instance.genre.all()
+            )
+        return state
 
     def get_serializer_class(self):
         """Определение сериалайзера."""
@@ -55,39 +149,334 @@ class TitleViewSet(viewsets.ModelViewSet):
         return TitleSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SparseFieldsMixin, ValuesListMixin,
+                    ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (ModerOrAuthorOrReadOnly,)
+    pagination_class = PubDateCursorPagination
 
     def get_title(self):
-        return get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
-        )
+        if not hasattr(self, '_title'):
+            titles = Title.objects.all()
+            if self.is_field_requested('author'):
+                titles = titles.annotate(users_updated=users_updated())
+            self._title = get_object_or_404(
+                titles,
+                id=self.kwargs.get('title_id')
+            )
+        return self._title
+
+    def get_list_state(self, queryset):
+        """Сохранённые в произведении счётчик и дата изменения отзывов.
+
+        Любое изменение отзыва, включая удаление, обновляет строку
+        произведения, поэтому валидаторы и Last-Modified берутся из неё
+        без агрегата по таблице отзывов. Авторы показаны по username,
+        поэтому учитывается и дата изменения пользователей.
+        """
+        title = self.get_title()
+        users = getattr(title, 'users_updated', None)
+        return {
+            'count': title.reviews_count,
+            'last_id': title.pk,
+            'users': users,
+            'last_modified': latest(title.updated, users),
+        }
+
+    def get_object_state(self, instance):
+        """Отзыв вместе с названием произведения и username автора."""
+        title = self.get_title()
+        users = getattr(title, 'users_updated', None)
+        return {
+            'last_id': instance.pk,
+            'title': title.updated,
+            'users': users,
+            'last_modified': latest(instance.updated, title.updated, users),
+        }
 
     def get_queryset(self):
         title = self.get_title()
-        return title.reviews.all()
+        return title.reviews.select_related('author')
 
     def perform_create(self, serializer):
+        """Дубль отзыва ловит ограничение unique_review, без SELECT.
+
+        Проверка существования отзыва выполняется только после ошибки:
+        другие нарушения целостности пробрасываются дальше.
+        """
         title = self.get_title()
-        serializer.save(author=self.request.user, title=title)
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            if not title.reviews.filter(author=self.request.user).exists():
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW]}
+            )
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(SparseFieldsMixin, ValuesListMixin,
+                     ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (ModerOrAuthorOrReadOnly,)
+    pagination_class = PubDateCursorPagination
+    versioning_class = CompactVersioning
+
+    def get_serializer_class(self):
+        if self.request.version == COMPACT_VERSION:
+            return CompactCommentSerializer
+        return CommentSerializer
+
+    def get_etag_extra(self):
+        return self.request.version
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id')
-        )
+        if not hasattr(self, '_review'):
+            reviews = Review.objects.all()
+            if self.is_field_requested('author'):
+                reviews = reviews.annotate(users_updated=users_updated())
+            if self.request.version == COMPACT_VERSION:
+                reviews = reviews.defer('text')
+            self._review = get_object_or_404(
+                reviews,
+                id=self.kwargs.get('review_id')
+            )
+        return self._review
+
+    def get_related_state(self):
+        """Текст отзыва (кроме компактной версии) и username авторов."""
+        review = self.get_review()
+        state = {'users': getattr(review, 'users_updated', None)}
+        if self.request.version != COMPACT_VERSION:
+            state['review'] = review.updated
+        return state
+
+    def get_list_state(self, queryset):
+        return {
+            **super().get_list_state(queryset), **self.get_related_state()
+        }
+
+    def get_object_state(self, instance):
+        state = self.get_related_state()
+        state['last_modified'] = latest(instance.updated, *state.values())
+        state['last_id'] = instance.pk
+        return state
 
     def get_queryset(self):
         review = self.get_review()
-        return review.comments.all()
+        return review.comments.select_related('author')
 
     def perform_create(self, serializer):
         review = self.get_review()
         serializer.save(author=self.request.user, review=review)
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка всей таблицы в NDJSON или CSV.
+
+    Формат выбирается заголовком Accept или параметром ?format=ndjson|csv.
+    Строки читаются частями по EXPORT_CHUNK_SIZE, поэтому память не
+    зависит от размера таблицы.
+    """
+
+    permission_classes = (AdminOnly,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+    queryset = None
+    serializer_class = None
+    filename = None
+
+    def get(self, request):
+        serializer = ValuesListSerializer(self.serializer_class())
+        fields = [name for name, _ in serializer.getters]
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(
+                serializer.iterate(
+                    self.queryset.all(), settings.EXPORT_CHUNK_SIZE
+                ),
+                fields
+            ),
+            content_type=renderer.media_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.filename}.{renderer.format}"'
+        )
+        return response
+
+
+class TitleExportView(ExportView):
+    queryset = Title.objects.all()
+    serializer_class = GETTitleSerializer
+    filename = 'titles'
+
+
+class ReviewExportView(ExportView):
+    queryset = Review.objects.all()
+    serializer_class = ReviewSerializer
+    filename = 'reviews'
+
+
+class AutocompleteView(APIView):
+    """Подсказки по началу или части названия.
+
+    ?q= — набранный текст, ?type= — через запятую titles, genres,
+    categories (по умолчанию все), ?limit= — не больше
+    AUTOCOMPLETE_MAX_LIMIT на каждый тип. Произведения упорядочены
+    по рейтингу.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        params = request.query_params
+        kinds = params.get('type')
+        kinds = kinds.split(',') if kinds else list(autocomplete.sources)
+        unknown = set(kinds) - set(autocomplete.sources)
+        if unknown:
+            raise ValidationError(
+                {'type': [f'Неизвестные типы: {", ".join(sorted(unknown))}.']}
+            )
+        try:
+            limit = int(params.get('limit', settings.AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': ['Ожидается целое число.']})
+        limit = max(1, min(limit, settings.AUTOCOMPLETE_MAX_LIMIT))
+        return Response(
+            autocomplete.search(params.get('q', ''), kinds, limit)
+        )
+
+
+class TextSearchView(generics.ListAPIView):
+    """Полнотекстовый поиск по текстам для модераторов и админов.
+
+    ?q= — слова, которые должны встретиться в тексте (в любой форме),
+    ?title= — id произведения, ?author= — username автора. Результаты
+    от новых к старым с курсорной пагинацией, в каждом сниппет с
+    совпадениями в <mark>.
+    """
+
+    permission_classes = (ModerOrAdmin,)
+    pagination_class = SearchCursorPagination
+    title_lookup = 'title'
+
+    def get_scope(self):
+        params = self.request.query_params
+        title = params.get('title')
+        if title is not None:
+            try:
+                title = int(title)
+            except ValueError:
+                raise ValidationError({'title': ['Ожидается целое число.']})
+        author = params.get('author')
+        if author is not None:
+            author = User.objects.filter(username=author).values_list(
+                'id', flat=True
+            ).first()
+            if author is None:
+                return None
+        return {'title': title, 'author': author}
+
+    def get_queryset(self):
+        text = self.request.query_params.get('q', '')
+        if not build_query(text):
+            raise ValidationError({'q': ['Укажите слова для поиска.']})
+        scope = self.get_scope()
+        queryset = self.queryset.select_related('author')
+        if scope is None:
+            return queryset.none().annotate(search_id=F('id'))
+        return search_texts(
+            queryset, text, title_lookup=self.title_lookup, **scope
+        )
+
+
+class ReviewSearchView(TextSearchView):
+    queryset = Review.objects.all()
+    serializer_class = ReviewSearchSerializer
+
+
+class CommentSearchView(TextSearchView):
+    queryset = Comment.objects.all()
+    serializer_class = CommentSearchSerializer
+    title_lookup = 'review__title'
+
+
+class LeaderboardView(APIView):
+    """Готовый рейтинг произведений: top-rated или most-reviewed.
+
+    ?genre= или ?category= — slug жанра или категории для рейтинга
+    внутри них, ?limit= — не больше LEADERBOARD_SIZE мест. Рейтинги
+    пересчитывает команда refreshleaderboards, время пересчёта
+    отдаётся в refreshed. Места нумеруются при чтении: удалённое после
+    пересчёта произведение уходит из таблицы каскадом и не оставляет
+    пропуска в нумерации.
+    """
+
+    permission_classes = (AllowAny,)
+    scopes = {
+        'genre': (Genre, 'Жанр не найден.'),
+        'category': (Category, 'Категория не найдена.'),
+    }
+
+    def get_filters(self, board):
+        params = self.request.query_params
+        filters = {'board': board}
+        scope = None
+        for name in self.scopes:
+            slug = params.get(name)
+            if not slug:
+                filters[f'{name}__isnull'] = True
+            elif scope is not None:
+                raise ValidationError(
+                    ['Укажите только жанр или только категорию.']
+                )
+            else:
+                filters[f'{name}__slug'] = slug
+                scope = name, slug
+        return filters, scope
+
+    def get(self, request, board):
+        if board not in dict(LeaderboardEntry.BOARDS):
+            raise NotFound('Неизвестный рейтинг.')
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.LEADERBOARD_LIMIT
+            ))
+        except ValueError:
+            raise ValidationError({'limit': ['Ожидается целое число.']})
+        limit = max(1, min(limit, settings.LEADERBOARD_SIZE))
+        filters, scope = self.get_filters(board)
+        rows = list(
+            LeaderboardEntry.objects.filter(**filters).values_list(
+                'title_id', 'title__name', 'title__year',
+                'rating', 'reviews_count', 'refreshed'
+            )[:limit]
+        )
+        if not rows and scope is not None:
+            model, message = self.scopes[scope[0]]
+            if not model.objects.filter(slug=scope[1]).exists():
+                raise NotFound(message)
+        return Response({
+            'refreshed': rows[0][-1] if rows else None,
+            'results': [
+                {
+                    'position': position,
+                    'id': title_id,
+                    'name': name,
+                    'year': year,
+                    'rating': int(rating) if rating is not None else None,
+                    'reviews_count': reviews_count,
+                }
+                for position, (
+                    title_id, name, year, rating, reviews_count, _
+                ) in enumerate(rows, 1)
+            ],
+        })
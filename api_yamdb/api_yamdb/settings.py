@@ -98,7 +98,17 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
+    ),
+    # Быстрый JSON на orjson; без него — стандартный json.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -106,8 +116,52 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': '30/min',
+        'auth_username': '5/min',
+    },
+    # Число доверенных прокси перед приложением. IP клиента для лимитов
+    # берётся из X-Forwarded-For только с их учётом, иначе заголовок
+    # можно подделать; 0 — всегда REMOTE_ADDR.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
+}
+
+# Хранилище корзин для ограничения частоты запросов к auth/. Общий для всех
+# процессов вариант — users.throttling.CacheBucketStore поверх CACHES.
+THROTTLE_BUCKET_STORE = os.getenv(
+    'THROTTLE_BUCKET_STORE', 'users.throttling.LocalBucketStore'
+)
+THROTTLE_MAX_BUCKETS = 100_000
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+    }
 }
 
+LIST_CACHE_TIMEOUT = 60 * 60
+FACETS_CACHE_TIMEOUT = 60 * 60
+# Сброс версий списков и фасетов виден всем процессам только в общем кэше.
+# С LocMemCache ответы хранятся не дольше LOCAL_CACHE_TIMEOUT секунд.
+LOCAL_CACHE_TIMEOUT = 10
+
+EXPORT_CHUNK_SIZE = 2000
+
+AUTOCOMPLETE_WARM_UP = True
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+AUTOCOMPLETE_REBUILD_INTERVAL = 10 * 60
+
+# Таблицы лидеров (leaderboards) пересчитывает команда refreshleaderboards.
+LEADERBOARD_SIZE = 100
+LEADERBOARD_LIMIT = 10
+LEADERBOARD_MIN_REVIEWS = 3
+LEADERBOARD_REFRESH_INTERVAL = 5 * 60
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -115,9 +169,24 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = 'users.User'
 
+USER_CACHE_TTL = 60
+USER_CACHE_MAX_SIZE = 100_000
+USER_CACHE_TRUST_TOKEN_CLAIMS = (
+    os.getenv('USER_CACHE_TRUST_TOKEN_CLAIMS', 'False') == 'True'
+)
+
 EMAIL_HOST = 'smtp.yandex.ru'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 EMAIL_PORT = 465
 EMAIL_USE_TLS = False
 EMAIL_USE_SSL = True
+
+# Очередь писем: отправляет команда sendemails. В режиме EMAIL_OUTBOX_EAGER
+# письмо отправляется сразу после коммита запроса.
+EMAIL_OUTBOX_EAGER = os.getenv('EMAIL_OUTBOX_EAGER', 'False') == 'True'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_POLL_INTERVAL = 5
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+EMAIL_OUTBOX_LEASE = 5 * 60
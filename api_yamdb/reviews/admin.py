@@ -45,7 +45,9 @@ class TitleAdmin(admin.ModelAdmin):
         'year',
         'category',
         'description',
+        'rating',
     )
+    readonly_fields = ('score_sum', 'reviews_count', 'rating')
     search_fields = ('name',)
     list_filter = ('name',)
     empty_value_display = '-пусто-'
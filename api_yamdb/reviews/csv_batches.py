@@ -0,0 +1,55 @@
+"""Разбор CSV пачками без обращения к Django.
+
+Модуль не импортирует модели, поэтому его функции можно выполнять в
+отдельных процессах без настройки Django.
+"""
+import csv
+import time
+from itertools import islice
+
+
+def read_batches(reader, batch_size):
+    """Выдаёт строки CSV списками не длиннее batch_size."""
+    while True:
+        batch = list(islice(reader, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def convert_row(row, columns, nullable):
+    """Переименовывает колонки в attname, пустые внешние ключи — в None."""
+    data = {columns[column]: value for column, value in row.items()}
+    for attname in nullable:
+        if data[attname] == '':
+            data[attname] = None
+    return data
+
+
+def iter_csv_batches(path, columns, nullable, batch_size):
+    with open(path, 'r', encoding='utf-8') as csv_file:
+        reader = csv.DictReader(csv_file)
+        for batch in read_batches(reader, batch_size):
+            yield [convert_row(row, columns, nullable) for row in batch]
+
+
+def parse_csv(path, columns, nullable, batch_size, queue, stop):
+    """Разбирает файл в процессе пула и передаёт пачки через очередь.
+
+    Последним в очередь всегда кладётся None, даже при ошибке, чтобы
+    потребитель не ждал вечно. Когда выставлено событие stop, разбор
+    прекращается досрочно. Возвращает время разбора в секундах без
+    ожидания места в очереди.
+    """
+    started = time.monotonic()
+    waited = 0
+    try:
+        for batch in iter_csv_batches(path, columns, nullable, batch_size):
+            if stop.is_set():
+                break
+            put_started = time.monotonic()
+            queue.put(batch)
+            waited += time.monotonic() - put_started
+    finally:
+        queue.put(None)
+    return time.monotonic() - started - waited
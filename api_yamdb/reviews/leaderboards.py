@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Category, Genre, LeaderboardEntry, Title
+
+INSERT_BATCH = 1000
+
+
+def board_orderings():
+    """Условие попадания в рейтинг и порядок произведений в нём."""
+    return {
+        LeaderboardEntry.TOP_RATED: (
+            {'reviews_count__gte': settings.LEADERBOARD_MIN_REVIEWS},
+            ('-rating', '-reviews_count', 'id')
+        ),
+        LeaderboardEntry.MOST_REVIEWED: (
+            {'reviews_count__gt': 0},
+            ('-reviews_count', '-rating', 'id')
+        ),
+    }
+
+
+def board_entries(board, condition, ordering, refreshed, **scope):
+    """Первые LEADERBOARD_SIZE произведений рейтинга одним запросом."""
+    rows = Title.objects.filter(
+        **condition, **{f'{name}__id': pk for name, pk in scope.items()}
+    ).order_by(*ordering).values_list(
+        'id', 'rating', 'reviews_count'
+    )[:settings.LEADERBOARD_SIZE]
+    return [
+        LeaderboardEntry(
+            board=board,
+            position=position,
+            title_id=title_id,
+            rating=rating,
+            reviews_count=reviews_count,
+            refreshed=refreshed,
+            **{f'{name}_id': pk for name, pk in scope.items()}
+        )
+        for position, (title_id, rating, reviews_count)
+        in enumerate(rows, 1)
+    ]
+
+
+def refresh_leaderboards():
+    """Пересчитывает все рейтинги: общие, по жанрам и по категориям.
+
+    Каждый рейтинг — один запрос с LIMIT по сохранённым в произведениях
+    оценкам и количеству отзывов. Старые строки заменяются новыми в
+    одной транзакции, поэтому читатели видят либо прежние рейтинги,
+    либо новые. Возвращает количество записанных строк.
+    """
+    refreshed = timezone.now()
+    scopes = [{}]
+    scopes += [
+        {'genre': pk} for pk in Genre.objects.values_list('pk', flat=True)
+    ]
+    scopes += [
+        {'category': pk}
+        for pk in Category.objects.values_list('pk', flat=True)
+    ]
+    entries = [
+        entry
+        for board, (condition, ordering) in board_orderings().items()
+        for scope in scopes
+        for entry in board_entries(
+            board, condition, ordering, refreshed, **scope
+        )
+    ]
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(entries, INSERT_BATCH)
+    return len(entries)
@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги произведений с нуля.'
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            updated = rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Рейтинги пересчитаны: {updated}.')
+        )
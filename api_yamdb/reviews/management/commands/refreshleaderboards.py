@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from reviews.leaderboards import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинги лучших и самых обсуждаемых произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.LEADERBOARD_REFRESH_INTERVAL,
+            help='Пауза в секундах между пересчётами.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Пересчитать один раз и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            written = refresh_leaderboards()
+            self.stdout.write(
+                f'Рейтинги пересчитаны: {written} строк за '
+                f'{time.monotonic() - started:.2f} с.'
+            )
+            if options['once']:
+                break
+            time.sleep(options['interval'])
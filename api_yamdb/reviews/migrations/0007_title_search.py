@@ -0,0 +1,77 @@
+# Generated by Django 3.2 on 2026-10-17 20:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.models
+
+
+def normalized(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+INSERT_ROW = (
+    'INSERT INTO reviews_title_fts(rowid, name, description) '
+    f"VALUES (new.id, {normalized('new.name')}, "
+    f"{normalized('new.description')});"
+)
+DELETE_ROW = 'DELETE FROM reviews_title_fts WHERE rowid = old.id;'
+
+CREATE_SQL = (
+    'CREATE VIRTUAL TABLE reviews_title_fts USING fts5('
+    'name, description, tokenize="unicode61 remove_diacritics 2")',
+    # Совпадение в названии весит в 10 раз больше, чем в описании.
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0)')",
+    'CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title '
+    f'BEGIN {INSERT_ROW} END',
+    'CREATE TRIGGER reviews_title_fts_update '
+    'AFTER UPDATE OF name, description ON reviews_title '
+    f'BEGIN {DELETE_ROW} {INSERT_ROW} END',
+    'CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title '
+    f'BEGIN {DELETE_ROW} END',
+    'INSERT INTO reviews_title_fts(rowid, name, description) '
+    f"SELECT id, {normalized('name')}, {normalized('description')} "
+    'FROM reviews_title',
+)
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql, params=None)
+    return run
+
+
+create_search_index = run_sqlite(CREATE_SQL)
+drop_search_index = run_sqlite(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearch',
+            fields=[
+                ('title', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('document', reviews.models.SearchDocumentField(db_column='reviews_title_fts')),
+                ('rank', models.FloatField(verbose_name='Релевантность')),
+            ],
+            options={
+                'db_table': 'reviews_title_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
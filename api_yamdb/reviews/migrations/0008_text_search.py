@@ -0,0 +1,111 @@
+# Generated by Django 3.2 on 2026-10-17 20:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.models
+
+
+def normalized(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def review_scope(row):
+    return f"'t' || {row}.title_id || ' a' || {row}.author_id"
+
+
+def comment_scope(row):
+    return (
+        "'t' || (SELECT title_id FROM reviews_review "
+        f"WHERE id = {row}.review_id) || ' a' || {row}.author_id"
+    )
+
+
+def index_sql(table, scope, parent):
+    """Внешнее содержимое индекса — представление с исходным текстом,
+    из него FTS5 берёт текст для сниппетов. В сам индекс текст попадает
+    с заменой «ё» на «е», поэтому заполнять его командой 'rebuild'
+    нельзя."""
+    fts = f'{table}_fts'
+    insert_row = (
+        f'INSERT INTO {fts}(rowid, text, scope) '
+        f"VALUES (new.id, {normalized('new.text')}, {scope('new')});"
+    )
+    delete_row = (
+        f'INSERT INTO {fts}({fts}, rowid, text, scope) '
+        f"VALUES ('delete', old.id, {normalized('old.text')}, "
+        f"{scope('old')});"
+    )
+    create = (
+        f'CREATE VIEW {fts}_content AS SELECT id, text, '
+        f'{scope(table)} AS scope FROM {table}',
+        f'CREATE VIRTUAL TABLE {fts} USING fts5(text, scope, '
+        f"content='{fts}_content', content_rowid='id', "
+        'tokenize="unicode61 remove_diacritics 2")',
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert_row} END',
+        f'CREATE TRIGGER {fts}_update '
+        f'AFTER UPDATE OF text, author_id, {parent} ON {table} '
+        f'BEGIN {delete_row} {insert_row} END',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete_row} END',
+        f'INSERT INTO {fts}(rowid, text, scope) '
+        f"SELECT id, {normalized('text')}, {scope(table)} FROM {table}",
+    )
+    drop = (
+        f'DROP TRIGGER IF EXISTS {fts}_insert',
+        f'DROP TRIGGER IF EXISTS {fts}_update',
+        f'DROP TRIGGER IF EXISTS {fts}_delete',
+        f'DROP TABLE IF EXISTS {fts}',
+        f'DROP VIEW IF EXISTS {fts}_content',
+    )
+    return create, drop
+
+
+REVIEW_SQL = index_sql('reviews_review', review_scope, 'title_id')
+COMMENT_SQL = index_sql('reviews_comment', comment_scope, 'review_id')
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql, params=None)
+    return run
+
+
+create_search_index = run_sqlite(REVIEW_SQL[0] + COMMENT_SQL[0])
+drop_search_index = run_sqlite(REVIEW_SQL[1] + COMMENT_SQL[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentSearch',
+            fields=[
+                ('comment', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.comment', verbose_name='Комментарий')),
+                ('document', reviews.models.SearchDocumentField(db_column='reviews_comment_fts')),
+            ],
+            options={
+                'db_table': 'reviews_comment_fts',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewSearch',
+            fields=[
+                ('review', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.review', verbose_name='Отзыв')),
+                ('document', reviews.models.SearchDocumentField(db_column='reviews_review_fts')),
+            ],
+            options={
+                'db_table': 'reviews_review_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
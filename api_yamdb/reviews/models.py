@@ -30,6 +30,10 @@ class Category(models.Model):
             )
         ]
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Категория'
@@ -57,6 +61,10 @@ class Genre(models.Model):
             )
         ]
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Жанр'
@@ -97,6 +105,24 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Жанр'
     )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Рейтинг'
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Произведение'
@@ -106,6 +132,43 @@ class Title(models.Model):
         return self.name
 
 
+class SearchDocumentField(models.TextField):
+    """Скрытый столбец FTS5 с именем таблицы, по которому работает MATCH."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class TitleSearch(models.Model):
+    """Полнотекстовый индекс FTS5 по названию и описанию произведений.
+
+    Таблица есть только в SQLite, её создаёт миграция и заполняют
+    триггеры на reviews_title. Буква «ё» в индексе заменена на «е».
+    """
+
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search',
+        verbose_name='Произведение'
+    )
+    document = SearchDocumentField(db_column='reviews_title_fts')
+    rank = models.FloatField(verbose_name='Релевантность')
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_title_fts'
+
+
 class GenreTitle(models.Model):
     """Смежная модель для связи жанра и произведения."""
 
@@ -152,6 +215,10 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -161,6 +228,12 @@ class Review(models.Model):
                 fields=('title', 'author'),
                 name='unique_review'
             )]
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
         ordering = ('-pub_date', )
 
     def __str__(self):
@@ -185,11 +258,147 @@ class Comment(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
         ordering = ('-pub_date',)
 
     def __str__(self):
         return self.text
+
+
+class ReviewSearch(models.Model):
+    """Полнотекстовый индекс FTS5 по текстам отзывов.
+
+    Таблица есть только в SQLite, её создаёт миграция и заполняют
+    триггеры на reviews_review. Кроме текста индексируется столбец
+    scope с метками произведения (t<id>) и автора (a<id>).
+    """
+
+    review = models.OneToOneField(
+        Review,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search',
+        verbose_name='Отзыв'
+    )
+    document = SearchDocumentField(db_column='reviews_review_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_review_fts'
+
+
+class CommentSearch(models.Model):
+    """Полнотекстовый индекс FTS5 по текстам комментариев.
+
+    Устроен как ReviewSearch, метка произведения берётся из отзыва.
+    """
+
+    comment = models.OneToOneField(
+        Comment,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search',
+        verbose_name='Комментарий'
+    )
+    document = SearchDocumentField(db_column='reviews_comment_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_comment_fts'
+
+
+class ImportWatermark(models.Model):
+    """Последняя дата публикации, загруженная командой loadcsv."""
+
+    table = models.CharField(
+        max_length=NAME_MAX_LEN,
+        unique=True,
+        verbose_name='Таблица'
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата публикации'
+    )
+
+    class Meta:
+        verbose_name = 'Отметка импорта'
+        verbose_name_plural = 'Отметки импорта'
+
+    def __str__(self):
+        return f'{self.table}: {self.pub_date}'
+
+
+class LeaderboardEntry(models.Model):
+    """Строка готового рейтинга произведений.
+
+    Рейтинги целиком пересчитывает команда refreshleaderboards; запрос
+    читает первые строки по индексу (board, genre, category, position).
+    Пустые genre и category — рейтинг по всем произведениям.
+    """
+
+    TOP_RATED = 'top-rated'
+    MOST_REVIEWED = 'most-reviewed'
+    BOARDS = (
+        (TOP_RATED, 'Лучшие по оценке'),
+        (MOST_REVIEWED, 'Больше всего отзывов'),
+    )
+
+    board = models.CharField(
+        max_length=max(len(board) for board, _ in BOARDS),
+        choices=BOARDS,
+        verbose_name='Рейтинг'
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='+',
+        verbose_name='Жанр'
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='+',
+        verbose_name='Категория'
+    )
+    position = models.PositiveIntegerField(verbose_name='Место')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Произведение'
+    )
+    rating = models.FloatField(null=True, verbose_name='Рейтинг')
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов'
+    )
+    refreshed = models.DateTimeField(verbose_name='Дата пересчёта')
+
+    class Meta:
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтингах'
+        indexes = (
+            models.Index(
+                fields=('board', 'genre', 'category', 'position'),
+                name='leaderboard_position_idx'
+            ),
+        )
+        ordering = ('position',)
+
+    def __str__(self):
+        return f'{self.board}: {self.position}. {self.title_id}'
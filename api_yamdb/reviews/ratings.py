@@ -0,0 +1,75 @@
+from django.db import transaction
+from django.db.models import (Avg, Case, Count, F, FloatField, OuterRef,
+                              Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Review, Title
+
+REBUILD_CHUNK = 500
+
+# Отправляется после коммита изменения рейтинга с аргументами title_id,
+# score_delta и count_delta.
+rating_changed = Signal()
+
+
+def apply_rating_delta(title_id, score_delta, count_delta):
+    """Сдвигает сохранённый рейтинг произведения одним UPDATE.
+
+    Все выражения в SET вычисляются по старым значениям строки,
+    поэтому сумма, количество и среднее меняются атомарно.
+    """
+    new_sum = F('score_sum') + score_delta
+    new_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=new_sum,
+        reviews_count=new_count,
+        rating=Case(
+            When(reviews_count=-count_delta, then=Value(None)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField()
+        ),
+        updated=timezone.now()
+    )
+    transaction.on_commit(lambda: rating_changed.send(
+        sender=Title, title_id=title_id,
+        score_delta=score_delta, count_delta=count_delta
+    ))
+
+
+def rebuild_ratings(title_ids=None):
+    """Пересчитывает рейтинги произведений по таблице отзывов.
+
+    Без title_ids пересчитываются все произведения, иначе только
+    указанные, пачками по REBUILD_CHUNK id.
+    """
+    if title_ids is None:
+        return _rebuild(Title.objects.all())
+    title_ids = list(title_ids)
+    return sum(
+        _rebuild(Title.objects.filter(
+            pk__in=title_ids[start:start + REBUILD_CHUNK]
+        ))
+        for start in range(0, len(title_ids), REBUILD_CHUNK)
+    )
+
+
+def _rebuild(titles):
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return titles.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0
+        ),
+        rating=Subquery(
+            reviews.annotate(total=Avg('score')).values('total')
+        ),
+        updated=timezone.now()
+    )
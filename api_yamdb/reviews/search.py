@@ -0,0 +1,111 @@
+import re
+from html import escape
+
+from django.db import connection
+from django.db.models import CharField, F, Func, Q, Value
+from django.db.models.functions import Left
+
+TOKEN_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile(r'[а-я]')
+# Окончания русских слов, от длинных к коротким.
+RUSSIAN_ENDINGS = (
+    'иями', 'ями', 'ами', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими',
+    'ой', 'ей', 'ий', 'ый', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие', 'ом',
+    'ем', 'ам', 'ям', 'ах', 'ях', 'ов', 'ев', 'ую', 'юю', 'ть',
+    'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь',
+)
+MIN_STEM_LEN = 4
+# Границы совпадений в сниппете: управляющие символы не встречаются в
+# тексте и не пострадают при экранировании HTML.
+MATCH_START, MATCH_END = '\x02', '\x03'
+SNIPPET_TOKENS = 24
+SNIPPET_FALLBACK_LEN = 200
+
+
+def normalize(text):
+    return text.lower().replace('ё', 'е')
+
+
+def stem(token):
+    """Отрезает окончание русского слова, оставляя основу от 4 букв."""
+    if not CYRILLIC_RE.search(token):
+        return token
+    for ending in RUSSIAN_ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= MIN_STEM_LEN:
+            return token[:-len(ending)]
+    return token
+
+
+def build_query(text):
+    """Запрос FTS5: все слова должны встретиться, каждое — как префикс
+    основы, чтобы находились другие падежи и формы."""
+    return ' '.join(
+        f'"{stem(token)}"*' for token in TOKEN_RE.findall(normalize(text))
+    )
+
+
+def search_titles(queryset, text):
+    """Произведения, подходящие под запрос, по убыванию релевантности.
+
+    Без FTS5 (не SQLite) ищет подстроку в названии и описании.
+    """
+    query = build_query(text)
+    if not query:
+        return queryset
+    if connection.vendor != 'sqlite':
+        return queryset.filter(
+            Q(name__icontains=text) | Q(description__icontains=text)
+        )
+    return queryset.filter(search__document__match=query).order_by(
+        'search__rank', 'id'
+    )
+
+
+class Snippet(Func):
+    """Фрагмент текста вокруг совпадений, функция snippet() FTS5."""
+
+    function = 'snippet'
+    output_field = CharField()
+
+    def __init__(self, document):
+        super().__init__(
+            F(document), Value(0), Value(MATCH_START), Value(MATCH_END),
+            Value('…'), Value(SNIPPET_TOKENS)
+        )
+
+
+def search_texts(queryset, text, title=None, author=None,
+                 title_lookup='title'):
+    """Отзывы или комментарии с подходящим текстом, от новых к старым.
+
+    title и author — id произведения и автора, по ним поиск сужается
+    внутри индекса. Строки упорядочены по rowid индекса, поэтому SQLite
+    отдаёт страницу, не сортируя все совпадения. Каждая строка получает
+    search_id для курсора и snippet с отмеченными совпадениями.
+    Без FTS5 (не SQLite) ищет подстроку, сниппет — начало текста,
+    а произведение фильтруется по title_lookup.
+    """
+    query = build_query(text)
+    if connection.vendor != 'sqlite':
+        if title is not None:
+            queryset = queryset.filter(**{title_lookup: title})
+        if author is not None:
+            queryset = queryset.filter(author=author)
+        return queryset.filter(text__icontains=text).annotate(
+            search_id=F('id'), snippet=Left('text', SNIPPET_FALLBACK_LEN)
+        )
+    query = f'text : ({query})'
+    if title is not None:
+        query += f' AND scope : "t{int(title)}"'
+    if author is not None:
+        query += f' AND scope : "a{int(author)}"'
+    return queryset.filter(search__document__match=query).annotate(
+        search_id=F('search__pk'), snippet=Snippet('search__document')
+    )
+
+
+def highlight(snippet):
+    """Сниппет в HTML: текст экранирован, совпадения в <mark>."""
+    return escape(snippet).replace(MATCH_START, '<mark>').replace(
+        MATCH_END, '</mark>'
+    )
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Review
+from .ratings import apply_rating_delta
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Запоминает прежние произведение и оценку редактируемого отзыва."""
+    instance._old_rating = None
+    if instance._state.adding or instance.pk is None:
+        return
+    instance._old_rating = Review.objects.filter(
+        pk=instance.pk
+    ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    old = getattr(instance, '_old_rating', None)
+    if created or old is None:
+        apply_rating_delta(instance.title_id, instance.score, 1)
+        return
+    old_title_id, old_score = old
+    if old_title_id != instance.title_id:
+        apply_rating_delta(old_title_id, -old_score, -1)
+        apply_rating_delta(instance.title_id, instance.score, 1)
+    else:
+        # Даже без смены оценки обновляется дата изменения произведения.
+        apply_rating_delta(instance.title_id, instance.score - old_score, 0)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    apply_rating_delta(instance.title_id, -instance.score, -1)
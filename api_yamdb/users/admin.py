@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
@@ -16,3 +16,18 @@ class UserAdmin(admin.ModelAdmin):
     search_fields = ('username', 'role',)
     list_filter = ('username',)
     empty_value_display = '-пусто-'
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'to_email',
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('to_email',)
+    readonly_fields = ('created', 'sent_at', 'last_error')
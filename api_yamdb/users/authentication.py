@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import User
+
+CACHED_FIELDS = (
+    'id', 'username', 'role', 'is_staff', 'is_superuser', 'is_active'
+)
+TOKEN_CLAIMS = ('username', 'role', 'is_staff', 'is_superuser')
+
+
+class UserCache:
+    """Кэш полей пользователя в памяти процесса с ограниченным сроком жизни.
+
+    Записи живут USER_CACHE_TTL секунд. Сброс при изменении пользователя
+    действует только в текущем процессе, в остальных запись устареет
+    не позже чем через TTL. Сверх USER_CACHE_MAX_SIZE вытесняются
+    записи, которые дольше всего не читались.
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+        return entry[1]
+
+    def set(self, user_id, fields):
+        with self._lock:
+            self._data[user_id] = (
+                time.monotonic() + settings.USER_CACHE_TTL, fields
+            )
+            self._data.move_to_end(user_id)
+            while len(self._data) > settings.USER_CACHE_MAX_SIZE:
+                self._data.popitem(last=False)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+user_cache = UserCache()
+
+
+def build_user(fields):
+    """Пользователь только с полями для проверки прав, без запроса к БД.
+
+    Остальные поля отложены, как после .only(): обращение к ним загрузит
+    значение из базы, а save() не перезапишет их значениями по умолчанию.
+    """
+    names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in fields
+    ]
+    return User.from_db('default', names, [fields[name] for name in names])
+
+
+def access_token_for_user(user):
+    """Access-токен с ролью и флагами пользователя в claims."""
+    token = AccessToken.for_user(user)
+    for claim in TOKEN_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к таблице пользователей на каждый вызов.
+
+    Поля пользователя берутся из кэша процесса. Если включён
+    USER_CACHE_TRUST_TOKEN_CLAIMS и токен содержит роль, пользователь
+    собирается прямо из claims; смена роли тогда вступит в силу только
+    с новым токеном.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+
+        if settings.USER_CACHE_TRUST_TOKEN_CLAIMS and all(
+            claim in validated_token for claim in TOKEN_CLAIMS
+        ):
+            fields = {
+                claim: validated_token[claim] for claim in TOKEN_CLAIMS
+            }
+            return build_user({'id': user_id, 'is_active': True, **fields})
+
+        fields = user_cache.get(user_id)
+        if fields is None:
+            fields = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values(*CACHED_FIELDS).first()
+            if fields is None:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found'
+                )
+            user_cache.set(user_id, fields)
+
+        if not fields['is_active']:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return build_user(fields)
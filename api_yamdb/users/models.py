@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from django.contrib.auth.models import AbstractUser
 
@@ -7,6 +8,8 @@ from .validators import validate_username
 USERNAME_MAX_LEN = 150
 EMAIL_MAX_LEN = 254
 ROLE_MAX_LEN = 20
+SUBJECT_MAX_LEN = 255
+STATUS_MAX_LEN = 10
 
 
 class User(AbstractUser):
@@ -51,6 +54,11 @@ class User(AbstractUser):
         default=USER,
         verbose_name='Пользовательская роль'
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Дата изменения'
+    )
 
     @property
     def is_moderator(self):
@@ -67,3 +75,82 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку воркером sendemails."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='outgoing_emails',
+        verbose_name='Пользователь'
+    )
+    to_email = models.EmailField(
+        max_length=EMAIL_MAX_LEN,
+        verbose_name='Адрес получателя'
+    )
+    subject = models.CharField(
+        max_length=SUBJECT_MAX_LEN,
+        verbose_name='Тема'
+    )
+    body = models.TextField(verbose_name='Текст')
+    status = models.CharField(
+        max_length=STATUS_MAX_LEN,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    next_attempt = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки'
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt'),
+                name='outgoing_email_due_idx'
+            ),
+        )
+        constraints = (
+            # Не больше одного неотправленного письма на пользователя.
+            models.UniqueConstraint(
+                fields=('user',),
+                condition=models.Q(status='pending'),
+                name='unique_pending_email'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.to_email}: {self.subject}'
@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_email(user, subject, body):
+    """Ставит письмо пользователю в очередь на отправку.
+
+    У пользователя не больше одного неотправленного письма: повторный
+    вызов заменяет текст ожидающего письма, не сбрасывая счётчик попыток.
+    """
+    pending = OutgoingEmail.objects.filter(
+        user=user, status=OutgoingEmail.PENDING
+    )
+    fields = {'to_email': user.email, 'subject': subject, 'body': body}
+    if not pending.update(**fields):
+        try:
+            with transaction.atomic():
+                OutgoingEmail.objects.create(user=user, **fields)
+        except IntegrityError:
+            # Письмо успел поставить параллельный запрос.
+            pending.update(**fields)
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(lambda: deliver_pending(1, user=user))
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim_pending(batch_size, user=None):
+    """Забирает готовые к отправке письма.
+
+    Следующая попытка отодвигается на EMAIL_OUTBOX_LEASE, чтобы
+    параллельный воркер не отправил те же письма ещё раз.
+    """
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING, next_attempt__lte=now
+    )
+    if user is not None:
+        due = due.filter(user=user)
+    with transaction.atomic():
+        ids = list(
+            due.select_for_update(skip_locked=True)
+            .order_by('next_attempt')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        OutgoingEmail.objects.filter(pk__in=ids).update(
+            next_attempt=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+    return list(OutgoingEmail.objects.filter(pk__in=ids))
+
+
+def send_batch(messages):
+    """Отправляет письма через одно соединение.
+
+    Возвращает списки отправленных и неотправленных писем.
+    """
+    sent, failed = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+        for message in messages:
+            try:
+                EmailMessage(
+                    subject=message.subject,
+                    body=message.body,
+                    to=(message.to_email,),
+                    from_email=settings.EMAIL_HOST_USER,
+                    connection=connection
+                ).send()
+            except Exception as error:
+                message.last_error = repr(error)
+                failed.append(message)
+            else:
+                sent.append(message)
+    except Exception as error:
+        # Не удалось открыть соединение: откладываются все оставшиеся.
+        for message in messages[len(sent) + len(failed):]:
+            message.last_error = repr(error)
+            failed.append(message)
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def deliver_pending(batch_size, user=None):
+    """Отправляет пачку готовых писем из очереди.
+
+    Неудачные письма откладываются с экспоненциальной задержкой, после
+    EMAIL_OUTBOX_MAX_ATTEMPTS попыток помечаются как FAILED.
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    messages = claim_pending(batch_size, user=user)
+    if not messages:
+        return 0, 0
+    sent, failed = send_batch(messages)
+
+    now = timezone.now()
+    for message in sent:
+        message.status = OutgoingEmail.SENT
+        message.sent_at = now
+        message.attempts += 1
+        message.last_error = ''
+    for message in failed:
+        message.attempts += 1
+        if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            message.status = OutgoingEmail.FAILED
+        else:
+            message.next_attempt = now + retry_delay(message.attempts)
+    OutgoingEmail.objects.bulk_update(
+        sent + failed,
+        ('status', 'sent_at', 'attempts', 'next_attempt', 'last_error')
+    )
+    return len(sent), len(failed)
@@ -41,13 +41,23 @@ class SignUpSerializer(serializers.ModelSerializer):
         return username
 
     def validate(self, data):
-        if User.objects.filter(username=data['username']).exists():
-            user = User.objects.get(username=data['username'])
-            if user.email == data['email']:
-                return data
+        user = User.objects.filter(username=data['username']).first()
+        if user is not None and user.email != data['email']:
             raise serializers.ValidationError({'message": "Email уже занят'})
+        # Найденный пользователь переиспользуется в create без
+        # повторного запроса.
+        data['user'] = user
         return data
 
+    def create(self, validated_data):
+        user = validated_data['user']
+        if user is None:
+            user = User.objects.create(
+                username=validated_data['username'],
+                email=validated_data['email']
+            )
+        return user
+
     class Meta:
         model = User
         fields = ('email', 'username')
@@ -0,0 +1,129 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocalBucketStore:
+    """Корзины токенов в памяти процесса.
+
+    Каждый процесс считает запросы отдельно, поэтому при нескольких
+    воркерах фактический лимит во столько же раз выше. Корзин не больше
+    THROTTLE_MAX_BUCKETS: сверх этого вытесняется та, к которой дольше
+    всех не обращались.
+    """
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        """Забирает токен из корзины.
+
+        Возвращает признак успеха и время в секундах до появления
+        следующего токена.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > settings.THROTTLE_MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+        return allowed, None if allowed else (1 - tokens) / refill_rate
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """Корзины токенов в общем кэше Django, одни на все процессы.
+
+    Чтение и запись корзины не атомарны: при одновременных запросах
+    лимит может быть превышен на несколько запросов.
+    """
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        cache.set(key, (tokens, now), int(capacity / refill_rate) + 1)
+        return allowed, None if allowed else (1 - tokens) / refill_rate
+
+    def clear(self):
+        pass
+
+
+_store = None
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        _store = import_string(settings.THROTTLE_BUCKET_STORE)()
+    return _store
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов по алгоритму корзины токенов.
+
+    Частота задаётся как в DRF, например '5/min': корзина вмещает
+    5 токенов и пополняется на 5 токенов в минуту. Корзины разделены
+    по throttle_scope представления и по get_ident_key, по умолчанию —
+    по IP-адресу клиента.
+    """
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return None
+        return self.cache_format % {
+            'scope': f'{self.scope}_{getattr(view, "throttle_scope", "")}',
+            'ident': ident
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self.wait_time = get_bucket_store().consume(
+            self.key, self.num_requests, self.num_requests / self.duration
+        )
+        return allowed
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPRateThrottle(TokenBucketThrottle):
+    scope = 'auth_ip'
+
+
+class UsernameRateThrottle(TokenBucketThrottle):
+    scope = 'auth_username'
+
+    def get_ident_key(self, request):
+        # Тело запроса ещё не проверено сериализатором.
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        return hashlib.md5(username.lower().encode()).hexdigest()
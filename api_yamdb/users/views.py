@@ -7,9 +7,10 @@ from rest_framework.filters import SearchFilter
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
+from .authentication import access_token_for_user
 from .models import User
+from .throttling import IPRateThrottle, UsernameRateThrottle
 from .confirm import send_conf_code
 from users.serializers import (GetTokenSerializer,
                                SignUpSerializer,
@@ -40,8 +41,10 @@ class UsersViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,),
     )
     def me(self, request):
+        # request.user собран из кэша аутентификации и содержит не все поля.
+        user = get_object_or_404(User, pk=request.user.pk)
         serializer = self.get_serializer(
-            request.user,
+            user,
             data=request.data,
             partial=True
         )
@@ -52,13 +55,15 @@ class UsersViewSet(viewsets.ModelViewSet):
             )
         if request.method == 'GET':
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer.validated_data['role'] = request.user.role
+        serializer.validated_data['role'] = user.role
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class APIGetTokenView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (IPRateThrottle, UsernameRateThrottle)
+    throttle_scope = 'token'
 
     def post(self, request):
         data = request.data
@@ -66,7 +71,7 @@ class APIGetTokenView(APIView):
         serializer.is_valid(raise_exception=True)
         user = get_object_or_404(User,
                                  username=data.get('username'))
-        access_token = AccessToken.for_user(user)
+        access_token = access_token_for_user(user)
         confirm_code = data['confirmation_code']
         if not default_token_generator.check_token(
             user,
@@ -80,18 +85,16 @@ class APIGetTokenView(APIView):
 
 class APISignUpView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (IPRateThrottle, UsernameRateThrottle)
+    throttle_scope = 'signup'
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
-            user, created = User.objects.get_or_create(
-                username=serializer.validated_data['username'],
-                email=serializer.validated_data['email']
-            )
+            user = serializer.save()
         except IntegrityError:
             return Response(serializer.errors,
                             status=status.HTTP_400_BAD_REQUEST)
-        if user or created:
-            send_conf_code(serializer.data.get('username'))
+        send_conf_code(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,73 @@
+"""Время подсказки по индексу PrefixTrigramIndex в памяти.
+
+Скрипт строит индекс по синтетическим названиям со случайным рейтингом
+и замеряет среднее время поиска для запросов разной длины. База данных
+не нужна.
+
+    python benchmarks/autocomplete.py --titles 500000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+WORDS = (
+    'туман', 'ёжик', 'солярис', 'сталкер', 'андромеда', 'ночь', 'город',
+    'зеркало', 'война', 'мир', 'брат', 'море', 'остров', 'звезда', 'дорога',
+    'осень', 'небо', 'история', 'тайна', 'время', 'река', 'лес', 'дом',
+    'песня', 'легенда', 'мастер', 'маргарита', 'капитан', 'дочь', 'сад',
+)
+QUERIES = (
+    'т', 'ту', 'тум', 'туман', 'ёжик ту', 'ромед', 'мастер марг', 'нет такого'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100_000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+
+    from api.v1.autocomplete import PrefixTrigramIndex, title_item
+
+    rng = random.Random(0)
+    index = PrefixTrigramIndex()
+    started = time.perf_counter()
+    index.build(
+        title_item(
+            pk, ' '.join(rng.sample(WORDS, rng.randint(1, 4))).capitalize(),
+            rng.randint(0, 100), rng.randint(0, 10)
+        )
+        for pk in range(1, args.titles + 1)
+    )
+    print(
+        f'Индекс из {args.titles} названий: '
+        f'{time.perf_counter() - started:.1f} с'
+    )
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        index.update(rng.randint(1, args.titles), rng.random() * 10)
+    elapsed = (time.perf_counter() - started) / args.repeat
+    print(f'  смена рейтинга: {elapsed * 1000:.3f} мс')
+    for query in QUERIES:
+        index.search(query, args.limit)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            result = index.search(query, args.limit)
+        elapsed = (time.perf_counter() - started) / args.repeat
+        print(
+            f'  {query!r}: {elapsed * 1000:.3f} мс, найдено {len(result)}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Время подсчёта фасетов списка произведений.
+
+Скрипт создаёт временную базу SQLite, применяет миграции, заполняет её
+синтетическими произведениями с жанрами и категориями и сравнивает
+подсчёт фасетов GROUP BY-запросами с чтением посчитанных из кэша.
+
+    python benchmarks/facets.py --titles 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+FACETS = ('genre', 'category', 'year')
+
+
+def fill(connection, titles, genres, categories):
+    with connection.cursor() as cursor:
+        for table, count in (
+            ('reviews_genre', genres), ('reviews_category', categories)
+        ):
+            cursor.execute(
+                'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+                'SELECT n + 1 FROM seq WHERE n < %s) '
+                f'INSERT INTO {table} (id, name, slug, updated) '
+                "SELECT n, 'name ' || n, 'slug-' || n, "
+                "'2020-01-01 00:00:00' FROM seq",
+                (count,)
+            )
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s) '
+            'INSERT INTO reviews_title (id, name, year, description, '
+            'category_id, score_sum, reviews_count, updated) '
+            "SELECT n, 'title ' || n, 1900 + n %% 120, '', n %% %s + 1, "
+            "0, 0, '2020-01-01 00:00:00' FROM seq",
+            (titles, categories)
+        )
+        for shift in range(3):
+            cursor.execute(
+                'INSERT INTO reviews_genretitle (title_id, genre_id) '
+                'SELECT id, (id * 7 + %s) %% %s + 1 FROM reviews_title',
+                (shift * 3, genres)
+            )
+        cursor.execute('ANALYZE')
+
+
+def measure(label, func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f'  {label}: {elapsed * 1000:.3f} мс')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100_000)
+    parser.add_argument('--genres', type=int, default=30)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    import django
+    from django.conf import settings
+
+    tmp = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(tmp.name) / 'bench.sqlite3'
+    django.setup()
+
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connection
+
+    from api.v1.facets import get_facets
+    from reviews.models import Title
+
+    call_command('migrate', verbosity=0)
+    fill(connection, args.titles, args.genres, args.categories)
+    print(f'Данные: {args.titles} произведений')
+
+    for label, titles, filters in (
+        ('все произведения', Title.objects.all(), []),
+        ('жанр slug-1', Title.objects.filter(genre__slug='slug-1'),
+         [('genre', 'slug-1')]),
+    ):
+        print(f'Фасеты, {label}:')
+
+        def cold():
+            cache.clear()
+            get_facets(titles, FACETS, filters)
+
+        measure('GROUP BY', cold, args.repeat)
+        measure(
+            'из кэша', lambda: get_facets(titles, FACETS, filters),
+            args.repeat * 100
+        )
+
+    connection.close()
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
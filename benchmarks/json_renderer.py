@@ -0,0 +1,102 @@
+"""Время кодирования страницы /api/v1/titles/ в JSON.
+
+Скрипт создаёт временную базу SQLite с произведениями, получает данные
+страницы списка через TitleViewSet и сравнивает стандартный JSONRenderer
+DRF с FastJSONRenderer на orjson. Если orjson не установлен, оба
+варианта совпадают.
+
+    python benchmarks/json_renderer.py --limit 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def fill(titles):
+    from reviews.models import Category, Genre, Title
+
+    category = Category.objects.create(name='Фильмы', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(5)
+    ]
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {idx}',
+            year=1900 + idx % 120,
+            description='Описание произведения ' * 5,
+            category=category,
+            score_sum=idx % 50,
+            reviews_count=idx % 7,
+            rating=(idx % 50) / (idx % 7) if idx % 7 else None,
+        )
+        for idx in range(titles)
+    )
+    through = Title.genre.through
+    through.objects.bulk_create(
+        through(title_id=pk, genre_id=genres[pk % 5].pk)
+        for pk in Title.objects.values_list('pk', flat=True)
+    )
+
+
+def measure(label, renderer, data, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        content = renderer.render(data)
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f'  {label}: {elapsed * 1_000_000:.1f} мкс, {len(content)} байт')
+    return content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    import django
+    from django.conf import settings
+
+    tmp = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(tmp.name) / 'bench.sqlite3'
+    settings.ALLOWED_HOSTS = ['*']
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory
+
+    from api.renderers import FastJSONRenderer, orjson
+    from api.v1.views import TitleViewSet
+
+    call_command('migrate', verbosity=0)
+    fill(args.titles)
+
+    request = APIRequestFactory().get(
+        '/api/v1/titles/', {'limit': args.limit}
+    )
+    data = TitleViewSet.as_view({'get': 'list'})(request).data
+    print(
+        f'Страница из {len(data["results"])} произведений, '
+        f'orjson: {"есть" if orjson else "нет"}'
+    )
+    expected = measure('JSONRenderer', JSONRenderer(), data, args.repeat)
+    content = measure(
+        'FastJSONRenderer', FastJSONRenderer(), data, args.repeat
+    )
+    print(f'  ответы совпадают: {"да" if content == expected else "нет"}')
+
+    connection.close()
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Время пересчёта и чтения рейтингов произведений.
+
+Скрипт создаёт временную базу SQLite, применяет миграции, заполняет её
+синтетическими произведениями с сохранёнными оценками, пересчитывает
+рейтинги и сравнивает чтение готового рейтинга с сортировкой
+произведений при каждом запросе.
+
+    python benchmarks/leaderboards.py --titles 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+LIMIT = 10
+
+
+def fill(connection, titles, genres, categories):
+    with connection.cursor() as cursor:
+        for table, count in (
+            ('reviews_genre', genres), ('reviews_category', categories)
+        ):
+            cursor.execute(
+                'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+                'SELECT n + 1 FROM seq WHERE n < %s) '
+                f'INSERT INTO {table} (id, name, slug, updated) '
+                "SELECT n, 'name ' || n, 'slug-' || n, "
+                "'2020-01-01 00:00:00' FROM seq",
+                (count,)
+            )
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s) '
+            'INSERT INTO reviews_title (id, name, year, description, '
+            'category_id, score_sum, reviews_count, rating, updated) '
+            "SELECT n, 'title ' || n, 2000, '', n %% %s + 1, "
+            'n * 7 %% 50 * (n %% 10 + 1), n * 7 %% 50, '
+            'CASE WHEN n * 7 %% 50 THEN n %% 10 + 1 END, '
+            "'2020-01-01 00:00:00' FROM seq",
+            (titles, categories)
+        )
+        for shift in range(3):
+            cursor.execute(
+                'INSERT INTO reviews_genretitle (title_id, genre_id) '
+                'SELECT id, (id * 7 + %s) %% %s + 1 FROM reviews_title',
+                (shift * 3, genres)
+            )
+        cursor.execute('ANALYZE')
+
+
+def measure(connection, label, queryset, repeat):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = [row[-1] for row in cursor.fetchall()]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            cursor.execute(sql, params)
+            cursor.fetchall()
+        elapsed = (time.perf_counter() - started) / repeat
+    print(f'  {label}: {elapsed * 1000:.3f} мс')
+    for line in plan:
+        print(f'    {line}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100_000)
+    parser.add_argument('--genres', type=int, default=30)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    import django
+    from django.conf import settings
+
+    tmp = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(tmp.name) / 'bench.sqlite3'
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from reviews.leaderboards import refresh_leaderboards
+    from reviews.models import LeaderboardEntry, Title
+
+    call_command('migrate', verbosity=0)
+    fill(connection, args.titles, args.genres, args.categories)
+    started = time.perf_counter()
+    written = refresh_leaderboards()
+    print(
+        f'Данные: {args.titles} произведений, пересчёт рейтингов '
+        f'({written} строк): {time.perf_counter() - started:.2f} с'
+    )
+
+    min_reviews = settings.LEADERBOARD_MIN_REVIEWS
+    for label, entries, titles in (
+        ('все произведения',
+         LeaderboardEntry.objects.filter(
+             board=LeaderboardEntry.TOP_RATED,
+             genre__isnull=True, category__isnull=True
+         ),
+         Title.objects.all()),
+        ('жанр slug-1',
+         LeaderboardEntry.objects.filter(
+             board=LeaderboardEntry.TOP_RATED,
+             genre__slug='slug-1', category__isnull=True
+         ),
+         Title.objects.filter(genre__slug='slug-1')),
+    ):
+        print(f'Лучшие по оценке, {label}:')
+        measure(
+            connection, 'готовый рейтинг',
+            entries.values_list(
+                'position', 'title_id', 'title__name', 'rating'
+            )[:LIMIT],
+            args.repeat
+        )
+        measure(
+            connection, 'сортировка произведений',
+            titles.filter(reviews_count__gte=min_reviews).order_by(
+                '-rating', '-reviews_count', 'id'
+            ).values_list('id', 'name', 'rating')[:LIMIT],
+            args.repeat
+        )
+
+    connection.close()
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
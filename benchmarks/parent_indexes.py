@@ -0,0 +1,153 @@
+"""Планы и время выборки отзывов и комментариев по родителю.
+
+Скрипт создаёт временную базу SQLite, применяет миграции, заполняет её
+синтетическими данными и сравнивает запросы ReviewViewSet и
+CommentViewSet с составными индексами (родитель, -pub_date, -id) и без них.
+Курсорная страница берётся из середины отзывов произведения: её условие
+строится так же, как в PubDateCursorPagination.
+
+    python benchmarks/parent_indexes.py --reviews 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+COMPOSITE_INDEXES = (
+    'review_title_pub_date_idx',
+    'comment_review_pub_date_idx',
+)
+
+
+def fill(connection, titles, reviews, comments):
+    authors = -(-reviews // titles)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s) '
+            'INSERT INTO users_user (id, password, is_superuser, username, '
+            'email, first_name, last_name, bio, role, is_staff, is_active, '
+            'date_joined, updated) '
+            "SELECT n, '', 0, 'user' || n, 'user' || n || '@yamdb.fake', "
+            "'', '', '', 'user', 0, 1, '2020-01-01 00:00:00', "
+            "'2020-01-01 00:00:00' FROM seq",
+            (authors,)
+        )
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s) '
+            'INSERT INTO reviews_title (id, name, year, description, '
+            'score_sum, reviews_count, updated) '
+            "SELECT n, 'title ' || n, 2000, '', 0, 0, "
+            "'2020-01-01 00:00:00' FROM seq",
+            (titles,)
+        )
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s - 1) '
+            'INSERT INTO reviews_review (id, title_id, author_id, text, '
+            'score, pub_date, updated) '
+            "SELECT n + 1, n %% %s + 1, n / %s + 1, 'review', n %% 10 + 1, "
+            "datetime('2020-01-01', '+' || (n * 7919 %% 31536000) "
+            "|| ' seconds'), '2020-01-01 00:00:00' FROM seq",
+            (reviews, titles, titles)
+        )
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s - 1) '
+            'INSERT INTO reviews_comment (id, review_id, author_id, text, '
+            'pub_date, updated) '
+            "SELECT n + 1, n %% %s + 1, n %% %s + 1, 'comment', "
+            "datetime('2020-01-01', '+' || (n * 7919 %% 31536000) "
+            "|| ' seconds'), '2020-01-01 00:00:00' FROM seq",
+            (comments, min(reviews, 1000), authors)
+        )
+        cursor.execute('ANALYZE')
+
+
+def measure(connection, label, queryset, repeat):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = [row[-1] for row in cursor.fetchall()]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            cursor.execute(sql, params)
+            cursor.fetchall()
+        elapsed = (time.perf_counter() - started) / repeat
+    print(f'  {label}: {elapsed * 1000:.3f} мс')
+    for line in plan:
+        print(f'    {line}')
+
+
+def run(connection, queries, repeat):
+    for label, queryset in queries:
+        measure(connection, label, queryset, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--reviews', type=int, default=1_000_000)
+    parser.add_argument('--comments', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    import django
+    from django.conf import settings
+
+    tmp = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(tmp.name) / 'bench.sqlite3'
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from api.v1.pagination import seek
+    from reviews.models import Comment, Review
+
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    fill(connection, args.titles, args.reviews, args.comments)
+    print(
+        f'Данные: {args.reviews} отзывов, {args.comments} комментариев, '
+        f'{time.perf_counter() - started:.1f} с'
+    )
+
+    title_reviews = Review.objects.filter(title_id=1).order_by(
+        '-pub_date', '-id'
+    )
+    depth = title_reviews.count() // 2
+    pub_date, pk = title_reviews.values_list('pub_date', 'id')[depth]
+    queries = (
+        ('отзывы произведения',
+         Review.objects.filter(title_id=1)[:10]),
+        ('отзывы произведения, курсор, первая страница',
+         title_reviews[:11]),
+        (f'отзывы произведения, курсор, глубина {depth}',
+         seek(title_reviews, pub_date, pk)[:11]),
+        ('комментарии к отзыву',
+         Comment.objects.filter(review_id=1)[:10]),
+    )
+
+    print('Составные индексы:')
+    run(connection, queries, args.repeat)
+
+    with connection.cursor() as cursor:
+        for name in COMPOSITE_INDEXES:
+            cursor.execute(f'DROP INDEX "{name}"')
+        cursor.execute('ANALYZE')
+    print('Только одноколоночные индексы:')
+    run(connection, queries, args.repeat)
+
+    connection.close()
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
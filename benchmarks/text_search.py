@@ -0,0 +1,137 @@
+"""Время полнотекстового поиска по отзывам.
+
+Скрипт создаёт временную базу SQLite, применяет миграции (индекс FTS5
+заполняется триггерами при вставке), заполняет её синтетическими
+отзывами и сравнивает первую страницу поиска через индекс с поиском
+подстроки LIKE по всей таблице.
+
+    python benchmarks/text_search.py --reviews 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+PAGE_SIZE = 10
+WORDS = 5000
+WORDS_PER_REVIEW = 12
+
+
+def fill(connection, titles, reviews):
+    authors = -(-reviews // titles)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s) '
+            'INSERT INTO users_user (id, password, is_superuser, username, '
+            'email, first_name, last_name, bio, role, is_staff, is_active, '
+            'date_joined, updated) '
+            "SELECT n, '', 0, 'user' || n, 'user' || n || '@yamdb.fake', "
+            "'', '', '', 'user', 0, 1, '2020-01-01 00:00:00', "
+            "'2020-01-01 00:00:00' FROM seq",
+            (authors,)
+        )
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s) '
+            'INSERT INTO reviews_title (id, name, year, description, '
+            'score_sum, reviews_count, updated) '
+            "SELECT n, 'title ' || n, 2000, '', 0, 0, "
+            "'2020-01-01 00:00:00' FROM seq",
+            (titles,)
+        )
+        # Слово wkx встречается в отзывах тем реже, чем больше k;
+        # суффикс x, чтобы одно слово не было началом другого.
+        words = ' || '.join(
+            f"' w' || (abs(random()) %% (abs(random()) %% {WORDS} + 1)) "
+            "|| 'x'"
+            for _ in range(WORDS_PER_REVIEW)
+        )
+        cursor.execute(
+            'WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL '
+            'SELECT n + 1 FROM seq WHERE n < %s - 1) '
+            'INSERT INTO reviews_review (id, title_id, author_id, text, '
+            'score, pub_date, updated) '
+            f"SELECT n + 1, n %% %s + 1, n / %s + 1, 'отзыв' || {words}, "
+            "n %% 10 + 1, '2020-01-01 00:00:00', '2020-01-01 00:00:00' "
+            'FROM seq',
+            (reviews, titles, titles)
+        )
+        cursor.execute('ANALYZE')
+
+
+def measure(connection, label, queryset, repeat):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        elapsed = (time.perf_counter() - started) / repeat
+    print(f'  {label}: {elapsed * 1000:.3f} мс, строк {len(rows)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--reviews', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    import django
+    from django.conf import settings
+
+    tmp = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(tmp.name) / 'bench.sqlite3'
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from reviews.models import Review
+    from reviews.search import search_texts
+
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    fill(connection, args.titles, args.reviews)
+    print(
+        f'Данные: {args.reviews} отзывов, '
+        f'{time.perf_counter() - started:.1f} с'
+    )
+
+    reviews = Review.objects.select_related('author')
+    for word in ('w1x', 'w100x', f'w{WORDS - 1}x'):
+        print(f'Слово {word}:')
+        found = search_texts(reviews, word).order_by('-search_id')
+        measure(connection, 'FTS5', found[:PAGE_SIZE], args.repeat)
+        measure(
+            connection, 'FTS5, произведение',
+            search_texts(reviews, word, title=1).order_by('-search_id')[
+                :PAGE_SIZE
+            ],
+            args.repeat
+        )
+        measure(
+            connection, 'FTS5, дальняя страница',
+            found.filter(search_id__lt=args.reviews // 10)[:PAGE_SIZE],
+            args.repeat
+        )
+        measure(
+            connection, 'LIKE',
+            reviews.filter(text__icontains=f' {word} ').order_by('-id')[
+                :PAGE_SIZE
+            ],
+            max(1, args.repeat // 10)
+        )
+
+    connection.close()
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,25 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    from django.core.signals import request_started
+    from api.v1.autocomplete import autocomplete
+    from users.authentication import user_cache
+    from users.throttling import get_bucket_store
+
+    cache.clear()
+    user_cache.clear()
+    get_bucket_store().clear()
+    # Фоновая сборка индекса подсказок в тестах не нужна.
+    request_started.disconnect(autocomplete.warm_up)
+    autocomplete.clear()
+
+
+@pytest.fixture(autouse=True)
+def eager_email_outbox(settings):
+    # Тесты регистрации ждут письмо сразу после запроса.
+    settings.EMAIL_OUTBOX_EAGER = True
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_title(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Плохо', 2)
+        review = create_single_review(
+            moderator_client, title_id, 'Хорошо', 9
+        ).json()
+        assert self.get_title(admin_client, title_id)['rating'] == 5, (
+            'Проверьте, что после создания отзывов поле `rating` '
+            'произведения содержит среднюю оценку.'
+        )
+
+        review_url = f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+        response = moderator_client.patch(review_url, data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(admin_client, title_id)['rating'] == 6, (
+            'Проверьте, что после изменения оценки в отзыве поле `rating` '
+            'произведения пересчитывается.'
+        )
+
+        response = moderator_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(admin_client, title_id)['rating'] == 2, (
+            'Проверьте, что после удаления отзыва поле `rating` '
+            'произведения пересчитывается.'
+        )
+        assert self.get_title(admin_client, titles[1]['id'])['rating'] is None
+
+    def test_02_rebuild_ratings(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 8)
+        Title.objects.update(score_sum=0, reviews_count=0, rating=None)
+
+        call_command('rebuildratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.reviews_count, title.rating) == (
+            8, 1, 8.0
+        ), (
+            'Проверьте, что команда `rebuildratings` пересчитывает '
+            'сохранённые рейтинги произведений.'
+        )
+        assert self.get_title(admin_client, title_id)['rating'] == 8
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import check_max_queries, create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    def test_01_titles_list(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for idx in range(8):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'genre': ['horror', 'drama'],
+                'category': 'films',
+                'description': 'Описание',
+            })
+        response = check_max_queries(client, '/api/v1/titles/', 3)
+        assert len(response.json()['results']) == 10
+        check_max_queries(client, f'/api/v1/titles/{titles[0]["id"]}/', 2)
+
+    def test_02_review_create(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        # Пользователь, произведение, BEGIN, INSERT отзыва и UPDATE
+        # рейтинга.
+        check_max_queries(
+            user_client, url, 5, method='post', data=data,
+            expected_status=HTTPStatus.CREATED
+        )
+        response = check_max_queries(
+            user_client, url, 5, method='post', data=data,
+            expected_status=HTTPStatus.BAD_REQUEST
+        )
+        assert 'non_field_errors' in response.json(), (
+            'Проверьте, что повторный отзыв на произведение возвращает '
+            'ошибку валидации.'
+        )
+
+    def test_03_reviews_and_comments_lists(self, client, admin_client,
+                                           admin, user_client, user,
+                                           moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = check_max_queries(client, url, 2)
+        assert {obj['author'] for obj in response.json()['results']} == {
+            review['author'] for review in reviews
+        }
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        response = check_max_queries(client, url, 3)
+        assert response.json()['results'][0]['review'] == 'review number 1'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                url, HTTP_ACCEPT='application/json; version=2'
+            )
+        assert len(context.captured_queries) <= 3
+        assert response.json()['results'][0]['review'] == reviews[0]['id'], (
+            'Проверьте, что во второй версии ответа комментарий ссылается '
+            'на отзыв по id.'
+        )
+
+    def test_04_signup(self, client, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+        url = '/api/v1/auth/signup/'
+        data = {'username': 'new_user', 'email': 'new_user@yamdb.fake'}
+        # Поиск и создание пользователя, письмо в очередь: UPDATE, BEGIN
+        # и INSERT.
+        check_max_queries(client, url, 5, method='post', data=data)
+        # Поиск пользователя и обновление ожидающего письма.
+        check_max_queries(client, url, 2, method='post', data=data)
+
+    def test_05_review_create_other_integrity_error(self, admin_client,
+                                                    user_client, monkeypatch):
+        from django.db import IntegrityError
+
+        from reviews import signals
+
+        def fail(*args):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        titles, _, _ = create_titles(admin_client)
+        monkeypatch.setattr(signals, 'apply_rating_delta', fail)
+        with pytest.raises(IntegrityError):
+            user_client.post(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                data={'text': 'Отзыв', 'score': 7}
+            )
@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def create_reviews(self, admin_client, django_user_model):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        for idx in range(5):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title_id=title_id, author=author, text=f'text {idx}',
+                score=5
+            )
+        first = Review.objects.order_by('id').first()
+        Review.objects.filter(title_id=title_id).update(
+            pub_date=first.pub_date
+        )
+        expected = list(
+            Review.objects.filter(title_id=title_id).order_by(
+                '-pub_date', '-id'
+            ).values_list('id', flat=True)
+        )
+        return title_id, expected
+
+    def test_01_cursor_walk(self, client, admin_client, django_user_model):
+        title_id, expected = self.create_reviews(
+            admin_client, django_user_model
+        )
+        url = f'/api/v1/titles/{title_id}/reviews/?cursor=&limit=2'
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме `cursor` ответ не содержит '
+                'ключ `count`.'
+            )
+            pages.append(data)
+            url = data['next']
+        ids = [obj['id'] for page in pages for obj in page['results']]
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация отдаёт отзывы по убыванию '
+            '(pub_date, id) без пропусков и повторов.'
+        )
+
+        response = client.get(pages[-1]['previous'])
+        assert [obj['id'] for obj in response.json()['results']] == [
+            obj['id'] for obj in pages[-2]['results']
+        ], (
+            'Проверьте, что ссылка `previous` в режиме `cursor` возвращает '
+            'предыдущую страницу.'
+        )
+
+    def test_02_limit_offset_kept(self, client, admin_client,
+                                  django_user_model):
+        title_id, expected = self.create_reviews(
+            admin_client, django_user_model
+        )
+        response = client.get(
+            f'/api/v1/titles/{title_id}/reviews/?limit=2&offset=2'
+        )
+        data = response.json()
+        assert data['count'] == len(expected), (
+            'Проверьте, что без параметра `cursor` сохраняется пагинация '
+            'limit/offset.'
+        )
+        assert len(data['results']) == 2
+
+    def test_03_invalid_cursor(self, client, admin_client,
+                               django_user_model):
+        title_id, _ = self.create_reviews(admin_client, django_user_model)
+        response = client.get(
+            f'/api/v1/titles/{title_id}/reviews/?cursor=broken'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_deep_cursor_page(self, client, admin_client,
+                                 django_user_model):
+        from datetime import timedelta
+
+        from api.v1.pagination import seek
+        from reviews.models import Review
+
+        title_id, _ = self.create_reviews(admin_client, django_user_model)
+        reviews = list(Review.objects.filter(title_id=title_id).order_by('id'))
+        for idx, review in enumerate(reviews):
+            Review.objects.filter(pk=review.pk).update(
+                pub_date=review.pub_date + timedelta(days=idx // 2)
+            )
+        expected = list(
+            Review.objects.filter(title_id=title_id).order_by(
+                '-pub_date', '-id'
+            ).values_list('id', flat=True)
+        )
+        url = f'/api/v1/titles/{title_id}/reviews/?cursor=&limit=1'
+        ids = []
+        while url:
+            data = client.get(url).json()
+            ids.extend(obj['id'] for obj in data['results'])
+            url = data['next']
+        assert ids == expected, (
+            'Проверьте, что курсор с разными и совпадающими `pub_date` '
+            'отдаёт отзывы без пропусков и повторов на глубоких страницах.'
+        )
+
+        last = Review.objects.get(pk=expected[-2])
+        plan = seek(
+            Review.objects.filter(title_id=title_id).order_by(
+                '-pub_date', '-id'
+            ),
+            last.pub_date, last.pk
+        ).explain()
+        assert 'pub_date<?' in plan, (
+            'Проверьте, что страница по курсору ищет по индексу '
+            '(title_id, pub_date), а не просматривает все строки до курсора.'
+        )
@@ -0,0 +1,181 @@
+import shutil
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11LoadCSV:
+
+    def test_01_load_all_tables(self):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        call_command('loadcsv', batch_size=7)
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comment.objects.exists()
+        assert GenreTitle.objects.count() == 42, (
+            'Проверьте, что `loadcsv` загружает связи из `genre_title.csv`.'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.category_id == 1
+        assert title.genre.exists()
+        assert title.reviews_count == title.reviews.count()
+
+    def test_02_bad_references(self, tmp_path):
+        from reviews.models import Title
+
+        for csv_f in DATA_DIR.glob('*.csv'):
+            shutil.copy(csv_f, tmp_path)
+        with open(tmp_path / 'titles.csv', 'a', encoding='utf-8') as f:
+            f.write('901,Нет категории,2000,77\n')
+        with open(tmp_path / 'genre_title.csv', 'a', encoding='utf-8') as f:
+            f.write('901,1,88\n902,1,89\n')
+
+        with pytest.raises(CommandError) as error:
+            call_command('loadcsv', data_dir=tmp_path)
+        message = str(error.value)
+        assert 'titles.csv, колонка category: 1 строк' in message
+        assert 'genre_title.csv, колонка genre_id: 2 строк' in message, (
+            'Проверьте, что `loadcsv` сообщает обо всех неверных ссылках '
+            'сразу.'
+        )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при неверных ссылках `loadcsv` ничего не '
+            'загружает.'
+        )
+
+    def test_03_parallel_workers(self):
+        from reviews.models import GenreTitle, Review, Title
+
+        call_command('loadcsv', workers=2, batch_size=10)
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert GenreTitle.objects.count() == 42, (
+            'Проверьте, что `loadcsv --workers` загружает все таблицы.'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.reviews_count == title.reviews.count()
+
+    def test_04_upsert_since(self, tmp_path):
+        from reviews.models import ImportWatermark, Review, Title
+
+        for csv_f in DATA_DIR.glob('*.csv'):
+            shutil.copy(csv_f, tmp_path)
+        call_command('loadcsv', data_dir=tmp_path)
+        watermark = ImportWatermark.objects.get(table='reviews_review')
+        assert watermark.pub_date == Review.objects.latest(
+            'pub_date'
+        ).pub_date, (
+            'Проверьте, что `loadcsv` сохраняет `pub_date` из CSV и '
+            'запоминает отметку импорта.'
+        )
+        Title.objects.filter(pk=1).update(name='Изменено')
+
+        call_command('loadcsv', data_dir=tmp_path, upsert=True)
+        assert Title.objects.get(pk=1).name == 'Побег из Шоушенка', (
+            'Проверьте, что `loadcsv --upsert` обновляет существующие '
+            'строки.'
+        )
+        assert Review.objects.count() == 72
+
+        with open(tmp_path / 'review.csv', 'a', encoding='utf-8') as f:
+            f.write('\n901,2,Новый,100,1,2030-01-01T00:00:00Z\n')
+            f.write('902,2,Старый,101,1,2001-01-01T00:00:00Z\n')
+        call_command('loadcsv', data_dir=tmp_path, upsert=True, since=True)
+        assert Review.objects.filter(pk=901).exists()
+        assert not Review.objects.filter(pk=902).exists(), (
+            'Проверьте, что `loadcsv --since` пропускает строки старше '
+            'отметки прошлого импорта.'
+        )
+        title = Title.objects.get(pk=2)
+        assert title.reviews_count == title.reviews.count()
+
+    def test_05_parallel_error(self):
+        from django.db import IntegrityError
+
+        call_command('loadcsv')
+        with pytest.raises(IntegrityError):
+            call_command('loadcsv', workers=2, batch_size=1)
+
+    def test_06_negative_ids(self, tmp_path):
+        from reviews.management.commands.loadcsv import IdSet
+
+        ids = IdSet()
+        ids.add(9)
+        assert 9 in ids and -9 not in ids
+        with pytest.raises(ValueError):
+            ids.add(-1)
+
+        for csv_f in DATA_DIR.glob('*.csv'):
+            shutil.copy(csv_f, tmp_path)
+        with open(tmp_path / 'genre.csv', 'a', encoding='utf-8') as f:
+            f.write('\n-5,Отрицательный,negative\n')
+        with pytest.raises(CommandError) as error:
+            call_command('loadcsv', data_dir=tmp_path)
+        assert 'genre.csv, колонка id: 1 строк' in str(error.value), (
+            'Проверьте, что `loadcsv` сообщает о неположительных id.'
+        )
+
+    def test_07_upsert_slug_remap(self, tmp_path):
+        from reviews.models import Category, Review, Title
+
+        for csv_f in DATA_DIR.glob('*.csv'):
+            shutil.copy(csv_f, tmp_path)
+        call_command('loadcsv', data_dir=tmp_path)
+        assert Review._meta.get_field('pub_date').auto_now_add, (
+            'Проверьте, что `loadcsv` не меняет настройки полей модели.'
+        )
+        category = tmp_path / 'category.csv'
+        category.write_text(
+            category.read_text(encoding='utf-8').replace(
+                '1,Фильм,movie', '501,Фильм,movie'
+            ),
+            encoding='utf-8'
+        )
+        titles = tmp_path / 'titles.csv'
+        lines = titles.read_text(encoding='utf-8').splitlines()
+        titles.write_text('\n'.join(
+            [lines[0]] + [
+                line[:-2] + ',501' if line.endswith(',1') else line
+                for line in lines[1:]
+            ]
+        ), encoding='utf-8')
+
+        call_command('loadcsv', data_dir=tmp_path, upsert=True)
+        assert not Category.objects.filter(pk=501).exists()
+        assert Title.objects.get(pk=1).category_id == 1, (
+            'Проверьте, что `loadcsv --upsert` переносит ссылки на '
+            'категорию, найденную по slug под другим id.'
+        )
+
+    def test_08_since_checks_only_new_rows(self, tmp_path):
+        from reviews.models import Comment
+
+        for csv_f in DATA_DIR.glob('*.csv'):
+            shutil.copy(csv_f, tmp_path)
+        call_command('loadcsv', data_dir=tmp_path)
+        with open(tmp_path / 'comments.csv', 'a', encoding='utf-8') as f:
+            f.write('\n901,9999,Старый,100,2001-01-01T00:00:00Z\n')
+        call_command('loadcsv', data_dir=tmp_path, upsert=True, since=True)
+        assert not Comment.objects.filter(pk=901).exists(), (
+            'Проверьте, что `loadcsv --since` проверяет ссылки только у '
+            'строк новее отметки импорта.'
+        )
+
+    @pytest.mark.parametrize('options', (
+        {'batch_size': 0}, {'batch_size': -1}, {'workers': 0}
+    ))
+    def test_09_bad_numbers(self, options):
+        from reviews.models import Genre
+
+        with pytest.raises(CommandError) as error:
+            call_command('loadcsv', **options)
+        assert 'не меньше 1' in str(error.value), (
+            'Проверьте, что `loadcsv` отклоняет `--batch-size` и '
+            '`--workers` меньше 1.'
+        )
+        assert not Genre.objects.exists()
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ListCache:
+
+    def check_cached_list(self, client, admin_client, url, new_data):
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из '
+            'кэша без запросов к базе данных.'
+        )
+        count = response.json()['count']
+
+        response = admin_client.post(url, data=new_data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(url).json()['count'] == count + 1, (
+            f'Проверьте, что после создания объекта кэш `{url}` '
+            'сбрасывается.'
+        )
+
+        admin_client.delete(f'{url}{new_data["slug"]}/')
+        assert client.get(url).json()['count'] == count, (
+            f'Проверьте, что после удаления объекта кэш `{url}` '
+            'сбрасывается.'
+        )
+
+    def test_01_categories_locmem(self, client, admin_client):
+        create_categories(admin_client)
+        self.check_cached_list(
+            client, admin_client, '/api/v1/categories/',
+            {'name': 'Музыка', 'slug': 'music'}
+        )
+
+    def test_02_genres_filebased(self, client, admin_client, settings,
+                                 tmp_path):
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+        create_genre(admin_client)
+        self.check_cached_list(
+            client, admin_client, '/api/v1/genres/',
+            {'name': 'Рок', 'slug': 'rock'}
+        )
+
+    def test_03_query_string_in_key(self, client, admin_client):
+        create_genre(admin_client)
+        response = client.get('/api/v1/genres/')
+        assert response.json()['count'] == 3
+        response = client.get('/api/v1/genres/?search=Ужасы')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что кэш списков учитывает строку запроса.'
+        )
+
+    def test_04_invalidate_on_commit(self):
+        from django.db import transaction
+
+        from api.v1.cache import get_list_version
+        from reviews.models import Category
+
+        version = get_list_version(Category)
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            assert get_list_version(Category) == version, (
+                'Проверьте, что кэш списков сбрасывается только после '
+                'фиксации транзакции.'
+            )
+        assert get_list_version(Category) != version
+
+    def test_05_locmem_timeout(self, settings, tmp_path):
+        from api.v1.cache import cache_timeout
+
+        assert cache_timeout(60 * 60) == settings.LOCAL_CACHE_TIMEOUT, (
+            'Проверьте, что с LocMemCache ответы хранятся недолго.'
+        )
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+        assert cache_timeout(60 * 60) == 60 * 60
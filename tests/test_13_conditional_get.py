@@ -0,0 +1,176 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils.http import http_date
+
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    def check_not_modified(self, client, url, last_modified=True):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        assert bool(response.get('Last-Modified')) == last_modified, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` '
+            f'{"" if last_modified else "не "}содержит заголовок '
+            '`Last-Modified`.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        return etag
+
+    def check_modified(self, client, url, etag):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после изменения данных GET-запрос к `{url}` '
+            'со старым `If-None-Match` возвращает ответ со статусом 200.'
+        )
+        assert response['ETag'] != etag
+
+    def test_01_reviews(self, client, admin_client, admin, user_client,
+                        user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        detail_url = f'{url}{reviews[1]["id"]}/'
+        list_etag = self.check_not_modified(client, url)
+        detail_etag = self.check_not_modified(client, detail_url)
+
+        response = user_client.patch(detail_url, data={'text': 'Изменено'})
+        assert response.status_code == HTTPStatus.OK
+        self.check_modified(client, url, list_etag)
+        self.check_modified(client, detail_url, detail_etag)
+
+    def test_02_comments(self, client, admin_client, admin, user_client,
+                         user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        etag = self.check_not_modified(client, url, last_modified=False)
+        user_client.delete(f'{url}{comments[1]["id"]}/')
+        self.check_modified(client, url, etag)
+
+    def test_03_titles(self, client, admin_client, user_client):
+        from reviews.models import Genre
+
+        _, titles = create_reviews(admin_client, {})
+        url = '/api/v1/titles/'
+        detail_url = f'{url}{titles[0]["id"]}/'
+        list_etag = self.check_not_modified(client, url, last_modified=False)
+        detail_etag = self.check_not_modified(
+            client, detail_url, last_modified=False
+        )
+
+        response = user_client.post(
+            f'{detail_url}reviews/', data={'text': 'Отзыв', 'score': 3}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        self.check_modified(client, url, list_etag)
+        self.check_modified(client, detail_url, detail_etag)
+
+        list_etag = self.check_not_modified(client, url, last_modified=False)
+        detail_etag = self.check_not_modified(
+            client, detail_url, last_modified=False
+        )
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Мюзикл', 'slug': 'musical'}
+        )
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=list_etag
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что новый жанр без произведений не меняет ETag '
+            'списка произведений.'
+        )
+        genre = Genre.objects.get(slug='horror')
+        genre.name = 'Хоррор'
+        genre.save()
+        self.check_modified(client, url, list_etag)
+        self.check_modified(client, detail_url, detail_etag)
+
+    def test_04_delete_if_modified_since(self, client, admin_client, admin,
+                                         user_client, user):
+        from reviews.models import Title
+        from users.models import User
+
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        since = http_date()
+        comments_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        admin_client.delete(f'{comments_url}{comments[0]["id"]}/')
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        for url in (comments_url, '/api/v1/titles/'):
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после удаления объекта GET-запрос к `{url}` '
+                'с `If-Modified-Since` возвращает ответ со статусом 200.'
+            )
+
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        Title.objects.filter(pk=titles[0]['id']).update(
+            updated='2020-01-01T00:00:00Z'
+        )
+        User.objects.update(updated='2020-01-01T00:00:00Z')
+        since = client.get(reviews_url)['Last-Modified']
+        admin_client.delete(f'{reviews_url}{reviews[0]["id"]}/')
+        response = client.get(reviews_url, HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление отзыва сдвигает `Last-Modified` списка '
+            'отзывов.'
+        )
+
+    def test_05_related_changes(self, client, admin_client, admin,
+                                user_client, user):
+        from reviews.models import Review, Title
+        from users.models import User
+
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review_url = f'{reviews_url}{reviews[0]["id"]}/'
+        comments_url = f'{review_url}comments/'
+        comment_url = f'{comments_url}{comments[0]["id"]}/'
+
+        etag = self.check_not_modified(
+            client, comments_url, last_modified=False
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+        review.text = 'Изменено'
+        review.save()
+        self.check_modified(client, comments_url, etag)
+
+        etag = self.check_not_modified(client, review_url)
+        title = Title.objects.get(pk=titles[0]['id'])
+        title.name = 'Новое название'
+        title.save()
+        self.check_modified(client, review_url, etag)
+
+        etags = {
+            url: self.check_not_modified(client, url)
+            for url in (reviews_url, comment_url)
+        }
+        author = User.objects.get(username=comments[0]['author'])
+        author.username = 'renamed'
+        author.save()
+        for url, etag in etags.items():
+            self.check_modified(client, url, etag)
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def users_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [
+        query for query in context.captured_queries
+        if 'users_user' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14AuthCache:
+
+    def test_01_user_cached(self, user_client):
+        url = '/api/v1/titles/'
+        assert users_queries(user_client, url)
+        assert not users_queries(user_client, url), (
+            'Проверьте, что повторный запрос с тем же токеном не обращается '
+            'к таблице пользователей.'
+        )
+
+    def test_02_role_change_invalidates(self, admin_client, user_client):
+        url = '/api/v1/users/'
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            f'{url}TestUser/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после смены роли пользователя кэш '
+            'аутентификации сбрасывается.'
+        )
+
+    def test_03_me_uses_full_user(self, user_client, user):
+        response = user_client.get('/api/v1/users/me/')
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'first_name': 'Имя'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.email == 'testuser@yamdb.fake'
+        assert user.bio == 'user bio', (
+            'Проверьте, что PATCH-запрос к `/api/v1/users/me/` не затирает '
+            'поля пользователя.'
+        )
+
+    def test_04_token_claims(self, settings, moderator):
+        from users.authentication import access_token_for_user
+
+        settings.USER_CACHE_TRUST_TOKEN_CLAIMS = True
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {access_token_for_user(moderator)}'
+        )
+        assert not users_queries(client, '/api/v1/titles/'), (
+            'Проверьте, что при USER_CACHE_TRUST_TOKEN_CLAIMS пользователь '
+            'восстанавливается из claims токена.'
+        )
+
+    def test_05_build_user_defers_fields(self, user):
+        from users.authentication import build_user
+
+        cached = build_user({
+            'id': user.id, 'username': user.username, 'role': user.role,
+            'is_staff': False, 'is_superuser': False, 'is_active': True,
+        })
+        assert not cached._state.adding
+        assert 'email' in cached.get_deferred_fields(), (
+            'Проверьте, что пользователь из кэша не заполняет незакэшированные '
+            'поля значениями по умолчанию.'
+        )
+        assert cached.email == 'testuser@yamdb.fake'
+
+    def test_06_lru_eviction(self, settings):
+        from users.authentication import UserCache
+
+        settings.USER_CACHE_MAX_SIZE = 2
+        cache = UserCache()
+        cache.set(1, {'id': 1})
+        cache.set(2, {'id': 2})
+        assert cache.get(1) == {'id': 1}
+        cache.set(3, {'id': 3})
+        assert cache.get(2) is None, (
+            'Проверьте, что при переполнении кэш пользователей вытесняет '
+            'запись, которая дольше всего не читалась.'
+        )
+        assert cache.get(1) == {'id': 1}
+        assert cache.get(3) == {'id': 3}
+
+        settings.USER_CACHE_TTL = -1
+        cache.set(4, {'id': 4})
+        assert cache.get(4) is None, (
+            'Проверьте, что устаревшая запись не отдаётся из кэша.'
+        )
+        assert 4 not in cache._data
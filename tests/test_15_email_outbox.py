@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+def signup(client, username):
+    response = client.post(SIGNUP_URL, data={
+        'username': username, 'email': f'{username}@yamdb.fake'
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15EmailOutbox:
+
+    @pytest.fixture(autouse=True)
+    def queued(self, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+
+    def test_01_signup_enqueues(self, client):
+        from users.models import OutgoingEmail
+
+        signup(client, 'first')
+        signup(client, 'first')
+        assert not mail.outbox, (
+            'Проверьте, что регистрация не отправляет письмо синхронно.'
+        )
+        assert OutgoingEmail.objects.filter(
+            status=OutgoingEmail.PENDING
+        ).count() == 1, (
+            'Проверьте, что у пользователя не больше одного письма в очереди.'
+        )
+
+        call_command('sendemails', '--once')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['first@yamdb.fake']
+        assert OutgoingEmail.objects.get().status == OutgoingEmail.SENT
+
+    def test_02_one_connection_per_batch(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_15_email_outbox.CountingBackend'
+        CountingBackend.opened = 0
+        for idx in range(3):
+            signup(client, f'user{idx}')
+
+        call_command('sendemails', '--once')
+        assert len(mail.outbox) == 3
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+
+    def test_03_retry_with_backoff(self, client, settings):
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_15_email_outbox.FailingBackend'
+        signup(client, 'retry')
+        call_command('sendemails', '--once')
+
+        message = OutgoingEmail.objects.get()
+        assert message.status == OutgoingEmail.PENDING
+        assert message.attempts == 1
+        assert message.next_attempt > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается.'
+        )
+        assert 'SMTP' in message.last_error
+
+        OutgoingEmail.objects.update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS - 1,
+            next_attempt=timezone.now()
+        )
+        call_command('sendemails', '--once')
+        message.refresh_from_db()
+        assert message.status == OutgoingEmail.FAILED
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        signup(client, 'retry')
+        call_command('sendemails', '--once')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что после исчерпания попыток повторная регистрация '
+            'ставит новое письмо.'
+        )
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+def signup(client, username):
+    return client.post(SIGNUP_URL, data={
+        'username': username, 'email': f'{username}@yamdb.fake'
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Throttling:
+
+    def test_01_username_bucket(self, client, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+        for _ in range(5):
+            assert signup(client, 'bot').status_code == HTTPStatus.OK
+
+        with CaptureQueriesContext(connection) as context:
+            response = signup(client, 'Bot')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{SIGNUP_URL}` с одним '
+            '`username` ограничиваются.'
+        )
+        assert response.get('Retry-After')
+        assert not context.captured_queries, (
+            'Проверьте, что отклонённый запрос не обращается к базе данных.'
+        )
+        assert signup(client, 'human').status_code == HTTPStatus.OK
+
+    def test_02_ip_bucket(self, client, monkeypatch):
+        from users.throttling import IPRateThrottle
+
+        monkeypatch.setitem(IPRateThrottle.THROTTLE_RATES, 'auth_ip', '3/min')
+        for idx in range(3):
+            response = client.post(TOKEN_URL, data={
+                'username': f'user{idx}', 'confirmation_code': '0'
+            })
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post(TOKEN_URL, data={
+            'username': 'another', 'confirmation_code': '0'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{TOKEN_URL}` с одного '
+            'адреса ограничиваются.'
+        )
+        assert signup(client, 'other').status_code == HTTPStatus.OK, (
+            'Проверьте, что лимиты эндпоинтов считаются раздельно.'
+        )
+
+
+def test_03_bucket_refill(monkeypatch):
+    from users import throttling
+
+    now = 1000.0
+    monkeypatch.setattr(throttling.time, 'monotonic', lambda: now)
+    store = throttling.LocalBucketStore()
+    assert store.consume('key', 2, 1)[0]
+    assert store.consume('key', 2, 1)[0]
+    allowed, wait = store.consume('key', 2, 1)
+    assert not allowed and wait == 1
+    now += 1
+    assert store.consume('key', 2, 1)[0], (
+        'Проверьте, что корзина пополняется со временем.'
+    )
+
+
+def test_04_bucket_lru(settings):
+    from users import throttling
+
+    settings.THROTTLE_MAX_BUCKETS = 2
+    store = throttling.LocalBucketStore()
+    store.consume('a', 1, 1)
+    store.consume('b', 1, 1)
+    store.consume('a', 1, 1)
+    store.consume('c', 1, 1)
+    assert list(store._buckets) == ['a', 'c'], (
+        'Проверьте, что при переполнении вытесняется корзина, к которой '
+        'дольше всех не обращались.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_05_forwarded_for_ignored(client, monkeypatch):
+    from users.throttling import IPRateThrottle
+
+    monkeypatch.setitem(IPRateThrottle.THROTTLE_RATES, 'auth_ip', '2/min')
+    statuses = [
+        client.post(
+            TOKEN_URL,
+            data={'username': 'user', 'confirmation_code': '0'},
+            HTTP_X_FORWARDED_FOR=f'10.0.0.{idx}'
+        ).status_code
+        for idx in range(3)
+    ]
+    assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+        'Проверьте, что подменой `X-Forwarded-For` нельзя обойти '
+        'ограничение по IP-адресу.'
+    )
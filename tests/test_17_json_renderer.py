@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17JSONRenderer:
+
+    def test_01_same_bytes(self, client, admin_client, admin, user_client,
+                           user):
+        from api.renderers import FastJSONRenderer
+
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url in (
+            '/api/v1/titles/',
+            review_url,
+            f'{review_url}{reviews[0]["id"]}/comments/',
+            '/api/v1/titles/?year=abc',
+        ):
+            response = client.get(url)
+            assert response.content == JSONRenderer().render(response.data)
+            assert response.content == FastJSONRenderer().render(
+                response.data
+            ), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` совпадает '
+                'с ответом стандартного JSONRenderer.'
+            )
+
+    def test_02_json_body(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/',
+            data='{"name": "Мюзикл", "slug": "musical"}',
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['name'] == 'Мюзикл'
+
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name":',
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
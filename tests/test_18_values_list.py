@@ -0,0 +1,61 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments
+
+
+def expected_page(serializer_class, model, results):
+    objs = model.objects.in_bulk([obj['id'] for obj in results])
+    return serializer_class(
+        [objs[obj['id']] for obj in results], many=True
+    ).data
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ValuesList:
+
+    def check_same(self, client, url, serializer_class, model, **headers):
+        response = client.get(url, **headers)
+        results = response.data['results']
+        assert results
+        expected = expected_page(serializer_class, model, results)
+        assert (
+            JSONRenderer().render(results) == JSONRenderer().render(expected)
+        ), (
+            f'Проверьте, что список `{url}` совпадает с ответом '
+            'сериализатора.'
+        )
+
+    def test_01_titles(self, client, admin_client, admin, user_client,
+                       user):
+        from api.v1.serializers import GETTitleSerializer
+        from reviews.models import Title
+
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        Title.objects.create(name='Без категории', year=2000, description='')
+        Title.objects.filter(pk=1).update(rating=6.5)
+        self.check_same(client, '/api/v1/titles/', GETTitleSerializer, Title)
+        self.check_same(
+            client, '/api/v1/titles/?genre=drama', GETTitleSerializer, Title
+        )
+
+    def test_02_reviews_and_comments(self, client, admin_client, admin,
+                                     user_client, user):
+        from api.v1.serializers import (CommentSerializer,
+                                        CompactCommentSerializer,
+                                        ReviewSerializer)
+        from reviews.models import Comment, Review
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        self.check_same(client, url, ReviewSerializer, Review)
+        self.check_same(client, f'{url}?cursor=', ReviewSerializer, Review)
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        self.check_same(client, url, CommentSerializer, Comment)
+        self.check_same(
+            client, url, CompactCommentSerializer, Comment,
+            HTTP_ACCEPT='application/json; version=2'
+        )
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), ' '.join(
+        query['sql'] for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SparseFields:
+
+    def test_01_titles(self, client, admin_client, admin, user_client,
+                       user):
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = '/api/v1/titles/?fields=id,name,rating'
+        data, sql = get_with_queries(client, url)
+        assert data['results']
+        for obj in data['results']:
+            assert set(obj) == {'id', 'name', 'rating'}, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает только '
+                'перечисленные поля.'
+            )
+        assert 'reviews_genre' not in sql and 'reviews_category' not in sql, (
+            'Проверьте, что без полей `genre` и `category` жанры и категории '
+            'не запрашиваются.'
+        )
+        assert 'description' not in sql
+
+        detail_url = f'/api/v1/titles/{titles[0]["id"]}/?fields=name,genre'
+        data, sql = get_with_queries(client, detail_url)
+        assert set(data) == {'name', 'genre'}
+        assert data['genre']
+        assert 'reviews_category' not in sql
+
+    def test_02_reviews_and_comments(self, client, admin_client, admin,
+                                     user_client, user, moderator_client,
+                                     moderator):
+        _, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        })
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            '?fields=id,score&cursor=&limit=1'
+        )
+        data, sql = get_with_queries(client, url)
+        assert set(data['results'][0]) == {'id', 'score'}
+        assert 'users_user' not in sql and 'INNER JOIN' not in sql, (
+            'Проверьте, что без полей `author` и `title` авторы и '
+            'произведения не присоединяются к запросу отзывов.'
+        )
+        next_page = client.get(data['next']).json()
+        assert set(next_page['results'][0]) == {'id', 'score'}
+        assert next_page['results'][0]['id'] != data['results'][0]['id']
+
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/?fields=text,author'
+        )
+        data, sql = get_with_queries(client, url)
+        assert set(data['results'][0]) == {'text', 'author'}
+
+    def test_03_unknown_field(self, client):
+        response = client.get('/api/v1/titles/?fields=id,password')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестных полей возвращает ответ со '
+            'статусом 400.'
+        )
+        assert 'fields' in response.json()
+
+    def test_04_unknown_field_with_etag(self, client, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/'):
+            etag = client.get(url, data={'fields': 'id'})['ETag']
+            response = client.get(
+                url, data={'fields': 'id,password'}, HTTP_IF_NONE_MATCH=etag
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что неизвестные поля возвращают ошибку 400 '
+                'даже с актуальным `If-None-Match`.'
+            )
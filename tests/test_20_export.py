@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+TITLES_URL = '/api/v1/export/titles/'
+REVIEWS_URL = '/api/v1/export/reviews/'
+
+
+def content(response):
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся потоком.'
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Export:
+
+    def test_01_admin_only(self, client, user_client):
+        assert client.get(TITLES_URL).status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.get(REVIEWS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что выгрузка доступна только администратору.'
+        )
+
+    def test_02_ndjson(self, admin_client, admin, user_client, user,
+                       settings):
+        settings.EXPORT_CHUNK_SIZE = 1
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.get(TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert [row['id'] for row in rows] == sorted(
+            title['id'] for title in titles
+        )
+        detail = admin_client.get(f'/api/v1/titles/{rows[0]["id"]}/').json()
+        assert rows[0] == detail, (
+            'Проверьте, что строка выгрузки совпадает с ответом API.'
+        )
+
+        response = admin_client.get(REVIEWS_URL, HTTP_ACCEPT=(
+            'application/x-ndjson'
+        ))
+        assert len(content(response).splitlines()) == len(reviews)
+
+    def test_03_csv(self, admin_client, admin, user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.get(f'{TITLES_URL}?format=csv')
+        assert response.status_code == HTTPStatus.OK
+        assert 'titles.csv' in response['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == len(titles)
+        assert rows[0]['category'] == titles[0]['category']
+        assert rows[0]['genre'] == ' '.join(titles[0]['genre'])
+
+        response = admin_client.get(f'{REVIEWS_URL}?format=csv')
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert {int(row['id']) for row in rows} == {
+            review['id'] for review in reviews
+        }
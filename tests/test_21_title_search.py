@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL = '/api/v1/titles/'
+
+
+def create_title(admin_client, name, description):
+    response = admin_client.post(URL, data={
+        'name': name,
+        'year': 2000,
+        'genre': ['drama'],
+        'category': 'films',
+        'description': description,
+    })
+    return response.json()['id']
+
+
+def search(client, query):
+    response = client.get(URL, data={'search': query})
+    return [obj['id'] for obj in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleSearch:
+
+    @pytest.fixture
+    def titles(self, admin_client):
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильмы', 'slug': 'films'}
+        )
+        return (
+            create_title(admin_client, 'Ёжик в тумане', 'Мультфильм'),
+            create_title(admin_client, 'Туманность Андромеды', 'Фантастика'),
+            create_title(
+                admin_client, 'Солярис', 'Океан и туман над планетой'
+            ),
+        )
+
+    def test_01_ranking(self, client, titles):
+        hedgehog, nebula, solaris = titles
+        found = search(client, 'туман')
+        assert set(found) == {hedgehog, nebula, solaris}, (
+            'Проверьте, что поиск находит разные формы слова.'
+        )
+        assert found[-1] == solaris, (
+            'Проверьте, что совпадения в названии выше совпадений в описании.'
+        )
+        assert search(client, 'ежик туманом') == [hedgehog], (
+            'Проверьте, что поиск не различает «е» и «ё» и требует все слова.'
+        )
+        assert search(client, 'ОКЕАН') == [solaris]
+        assert search(client, 'кино') == []
+
+    def test_02_index_updates(self, client, admin_client, titles):
+        hedgehog, _, solaris = titles
+        admin_client.patch(f'{URL}{solaris}/', data={'name': 'Сталкер'})
+        assert search(client, 'сталкер') == [solaris], (
+            'Проверьте, что поисковый индекс обновляется вместе с '
+            'произведением.'
+        )
+        admin_client.delete(f'{URL}{hedgehog}/')
+        assert hedgehog not in search(client, 'туман')
+
+    def test_03_uses_index(self, client, titles):
+        with CaptureQueriesContext(connection) as context:
+            search(client, 'туман')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'MATCH' in sql and 'LIKE' not in sql
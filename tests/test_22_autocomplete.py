@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL = '/api/v1/autocomplete/'
+
+
+def suggest(client, query, **params):
+    response = client.get(URL, data={'q': query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return response.json()
+
+
+def names(data, kind='titles'):
+    return [obj['name'] for obj in data[kind]]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Autocomplete:
+
+    @pytest.fixture
+    def titles(self, admin_client):
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильмы', 'slug': 'films'}
+        )
+        ids = {}
+        for name in ('Туманность Андромеды', 'Ёжик в тумане', 'Солярис'):
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': name, 'year': 2000, 'genre': ['drama'],
+                'category': 'films', 'description': 'Описание'
+            })
+            ids[name] = response.json()['id']
+        return ids
+
+    def test_01_prefix_and_rating(self, client, user_client, moderator_client,
+                                  titles):
+        data = suggest(client, 'ту')
+        assert set(names(data)) == {'Туманность Андромеды', 'Ёжик в тумане'}
+        assert set(data) == {'titles', 'genres', 'categories'}
+
+        for author_client, score in ((user_client, 9), (moderator_client, 7)):
+            author_client.post(
+                f'/api/v1/titles/{titles["Ёжик в тумане"]}/reviews/',
+                data={'text': 'Отзыв', 'score': score}
+            )
+        data = suggest(client, 'ту')
+        assert names(data) == ['Ёжик в тумане', 'Туманность Андромеды'], (
+            'Проверьте, что подсказки упорядочены по рейтингу и он '
+            'обновляется после новых отзывов.'
+        )
+        assert data['titles'][0]['rating'] == 8
+
+        assert names(suggest(client, 'ежик ту')) == ['Ёжик в тумане']
+        assert names(suggest(client, 'ромед')) == ['Туманность Андромеды'], (
+            'Проверьте, что подсказки находят подстроку в середине слова.'
+        )
+        assert names(suggest(client, 'фил', type='categories'), 'categories'
+                     ) == ['Фильмы']
+
+    def test_02_signals(self, client, admin_client, titles):
+        suggest(client, 'с')
+        admin_client.patch(
+            f'/api/v1/titles/{titles["Солярис"]}/', data={'name': 'Сталкер'}
+        )
+        admin_client.delete(f'/api/v1/titles/{titles["Ёжик в тумане"]}/')
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Мюзикл', 'slug': 'musical'}
+        )
+        with CaptureQueriesContext(connection) as context:
+            assert names(suggest(client, 'с')) == ['Сталкер']
+            assert names(suggest(client, 'ту')) == ['Туманность Андромеды']
+            assert names(suggest(client, 'мюз'), 'genres') == ['Мюзикл']
+        assert not context.captured_queries, (
+            'Проверьте, что подсказки берутся из индекса в памяти, '
+            'без запросов к базе данных.'
+        )
+
+    def test_03_params(self, client, titles):
+        assert len(suggest(client, 'т', limit=1)['titles']) == 1
+        assert suggest(client, '')['titles'] == []
+        response = client.get(URL, data={'q': 'т', 'type': 'users'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
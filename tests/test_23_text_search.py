@@ -0,0 +1,183 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import check_max_queries, create_titles
+
+REVIEWS_URL = '/api/v1/search/reviews/'
+COMMENTS_URL = '/api/v1/search/comments/'
+
+
+def post_review(client, title_id, text, score=5):
+    response = client.post(
+        f'/api/v1/titles/{title_id}/reviews/',
+        data={'text': text, 'score': score}
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    return response.json()['id']
+
+
+def post_comment(client, title_id, review_id, text):
+    response = client.post(
+        f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        data={'text': text}
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    return response.json()['id']
+
+
+def found(client, url, **params):
+    response = client.get(url, data=params)
+    assert response.status_code == HTTPStatus.OK
+    return [obj['id'] for obj in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TextSearch:
+
+    @pytest.fixture
+    def reviews(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        return {
+            'titles': (first, second),
+            'user_first': post_review(
+                user_client, first, 'Ёлки, какая <b>страшная</b> концовка!'
+            ),
+            'moderator_first': post_review(
+                moderator_client, first, 'Страшно и скучно.'
+            ),
+            'user_second': post_review(
+                user_client, second, 'Совсем не страшный фильм.'
+            ),
+        }
+
+    def test_01_permissions(self, client, user_client, moderator_client,
+                            admin_client, reviews):
+        for url in (REVIEWS_URL, COMMENTS_URL):
+            assert client.get(url, data={'q': 'страшный'}).status_code == (
+                HTTPStatus.UNAUTHORIZED
+            )
+            response = user_client.get(url, data={'q': 'страшный'})
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что поиск `{url}` недоступен обычному '
+                'пользователю.'
+            )
+            for staff_client in (moderator_client, admin_client):
+                response = staff_client.get(url, data={'q': 'страшный'})
+                assert response.status_code == HTTPStatus.OK, (
+                    f'Проверьте, что поиск `{url}` доступен модератору и '
+                    'админу.'
+                )
+
+    def test_02_word_forms_and_snippet(self, moderator_client, reviews):
+        assert found(moderator_client, REVIEWS_URL, q='страшный') == [
+            reviews['user_second'],
+            reviews['moderator_first'],
+            reviews['user_first'],
+        ], (
+            'Проверьте, что поиск находит разные формы слова и выдаёт '
+            'отзывы от новых к старым.'
+        )
+        assert found(moderator_client, REVIEWS_URL, q='елки') == [
+            reviews['user_first']
+        ]
+        response = moderator_client.get(REVIEWS_URL, data={'q': 'страшная'})
+        result = response.json()['results'][-1]
+        assert result['snippet'] == (
+            'Ёлки, какая &lt;b&gt;<mark>страшная</mark>&lt;/b&gt; концовка!'
+        ), (
+            'Проверьте, что сниппет экранирует HTML и отмечает совпадения '
+            'тегом <mark>.'
+        )
+        assert set(result) == {
+            'id', 'title', 'author', 'score', 'pub_date', 'snippet'
+        }
+
+    def test_03_scope(self, moderator_client, reviews):
+        first, second = reviews['titles']
+        assert found(
+            moderator_client, REVIEWS_URL, q='страшный', title=first
+        ) == [reviews['moderator_first'], reviews['user_first']], (
+            'Проверьте, что параметр `title` ограничивает поиск '
+            'произведением.'
+        )
+        assert found(
+            moderator_client, REVIEWS_URL, q='страшный', author='TestUser'
+        ) == [reviews['user_second'], reviews['user_first']], (
+            'Проверьте, что параметр `author` ограничивает поиск автором.'
+        )
+        assert found(
+            moderator_client, REVIEWS_URL, q='страшный', title=second,
+            author='TestModerator'
+        ) == []
+        assert found(
+            moderator_client, REVIEWS_URL, q='страшный', author='nobody'
+        ) == []
+
+    def test_04_index_follows_changes(self, moderator_client, user_client,
+                                      reviews):
+        first, _ = reviews['titles']
+        url = f'/api/v1/titles/{first}/reviews/{reviews["user_first"]}/'
+        response = user_client.patch(url, data={'text': 'Весёлая концовка'})
+        assert response.status_code == HTTPStatus.OK
+        assert reviews['user_first'] not in found(
+            moderator_client, REVIEWS_URL, q='страшный'
+        )
+        assert found(moderator_client, REVIEWS_URL, q='веселый') == [
+            reviews['user_first']
+        ], 'Проверьте, что изменённый текст отзыва попадает в индекс.'
+
+        assert user_client.delete(url).status_code == HTTPStatus.NO_CONTENT
+        assert found(moderator_client, REVIEWS_URL, q='концовка') == [], (
+            'Проверьте, что удалённый отзыв пропадает из поиска.'
+        )
+
+    def test_05_comments(self, moderator_client, user_client,
+                         admin_client, reviews):
+        first, second = reviews['titles']
+        on_first = post_comment(
+            user_client, first, reviews['moderator_first'],
+            'Согласен, скучное кино'
+        )
+        on_second = post_comment(
+            admin_client, second, reviews['user_second'], 'Скучный обзор'
+        )
+        assert found(moderator_client, COMMENTS_URL, q='скучно') == [
+            on_second, on_first
+        ]
+        assert found(
+            moderator_client, COMMENTS_URL, q='скучно', title=first
+        ) == [on_first], (
+            'Проверьте, что комментарии можно искать в пределах '
+            'произведения.'
+        )
+        response = moderator_client.get(COMMENTS_URL, data={'q': 'обзор'})
+        assert response.json()['results'][0]['review'] == (
+            reviews['user_second']
+        )
+
+    def test_06_pagination(self, moderator_client, reviews):
+        response = moderator_client.get(
+            REVIEWS_URL, data={'q': 'страшный', 'limit': 2}
+        )
+        data = response.json()
+        ids = [obj['id'] for obj in data['results']]
+        assert len(ids) == 2 and data['next'], (
+            'Проверьте, что результаты поиска разбиты на страницы.'
+        )
+        response = moderator_client.get(data['next'])
+        assert [obj['id'] for obj in response.json()['results']] == [
+            reviews['user_first']
+        ]
+        check_max_queries(
+            moderator_client, f'{REVIEWS_URL}?q=страшный&author=TestUser', 2
+        )
+
+    def test_07_bad_params(self, moderator_client, reviews):
+        for params in ({}, {'q': '!!!'}, {'q': 'фильм', 'title': 'x'}):
+            response = moderator_client.get(REVIEWS_URL, data=params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что без слов для поиска или с некорректным '
+                '`title` возвращается ошибка 400.'
+            )
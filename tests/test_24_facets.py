@@ -0,0 +1,158 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/'
+
+
+def get_facets(client, **params):
+    response = client.get(URL, data=params)
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['facets']
+
+
+def counts(items, key='slug'):
+    return {item[key]: item['count'] for item in items}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Facets:
+
+    @pytest.fixture
+    def titles(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'Космос',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        return titles, categories, genres
+
+    def test_01_counts(self, client, titles):
+        _, categories, genres = titles
+        facets = get_facets(client, facets='genre,category,year')
+        assert set(facets) == {'genre', 'category', 'year'}
+        assert counts(facets['genre']) == {
+            genres[0]['slug']: 2, genres[1]['slug']: 1, genres[2]['slug']: 2
+        }, (
+            'Проверьте, что `?facets=genre` возвращает количество '
+            'произведений каждого жанра.'
+        )
+        assert counts(facets['category']) == {
+            categories[0]['slug']: 2, categories[1]['slug']: 1
+        }
+        assert facets['category'][0] == {
+            'slug': categories[0]['slug'],
+            'name': categories[0]['name'],
+            'count': 2,
+        }
+        assert counts(facets['year'], 'year') == {
+            1984: 1, 1988: 1, 1979: 1
+        }
+
+        response = client.get(URL)
+        assert 'facets' not in response.json(), (
+            'Проверьте, что без параметра `facets` счётчики не добавляются.'
+        )
+
+    def test_02_filtered(self, client, titles):
+        _, categories, genres = titles
+        facets = get_facets(
+            client, facets='genre,category', genre=genres[0]['slug']
+        )
+        assert counts(facets['genre']) == {
+            genres[0]['slug']: 2, genres[1]['slug']: 1, genres[2]['slug']: 1
+        }, 'Проверьте, что счётчики фасетов учитывают текущий фильтр.'
+        assert counts(facets['category']) == {categories[0]['slug']: 2}
+        facets = get_facets(client, facets='year', year=1988)
+        assert counts(facets['year'], 'year') == {1988: 1}
+
+    def test_03_cached(self, client, titles):
+        get_facets(client, facets='genre,category,year', limit=1)
+        with CaptureQueriesContext(connection) as context:
+            get_facets(
+                client, facets='year,genre,category', limit=1, offset=1
+            )
+        assert not [
+            query for query in context.captured_queries
+            if 'GROUP BY' in query['sql']
+        ], (
+            'Проверьте, что счётчики фасетов берутся из кэша при '
+            'повторном запросе с теми же фильтрами.'
+        )
+
+    def test_04_invalidation(self, client, admin_client, titles):
+        created, categories, genres = titles
+        get_facets(client, facets='genre,category')
+        response = admin_client.patch(
+            f'{URL}{created[1]["id"]}/',
+            data={'genre': [genres[0]['slug']]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        facets = get_facets(client, facets='genre,category')
+        assert counts(facets['genre']) == {
+            genres[0]['slug']: 3, genres[1]['slug']: 1, genres[2]['slug']: 1
+        }, 'Проверьте, что счётчики обновляются при смене жанров.'
+
+        admin_client.delete(f'{URL}{created[0]["id"]}/')
+        admin_client.delete(f'/api/v1/categories/{categories[1]["slug"]}/')
+        facets = get_facets(client, facets='genre,category')
+        assert counts(facets['genre']) == {
+            genres[0]['slug']: 2, genres[2]['slug']: 1
+        }
+        assert counts(facets['category']) == {categories[0]['slug']: 1}, (
+            'Проверьте, что счётчики обновляются при удалении произведений '
+            'и категорий.'
+        )
+
+    def test_05_unknown(self, client, titles):
+        response = client.get(URL, data={'facets': 'genre,rating'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестный фасет возвращает ошибку 400.'
+        )
+        assert 'facets' in response.json()
+
+    def test_06_locmem_expiry(self, client, titles, settings):
+        settings.LOCAL_CACHE_TIMEOUT = 0
+        get_facets(client, facets='genre')
+        with CaptureQueriesContext(connection) as context:
+            get_facets(client, facets='genre')
+        assert [
+            query for query in context.captured_queries
+            if 'GROUP BY' in query['sql']
+        ], (
+            'Проверьте, что с LocMemCache счётчики фасетов хранятся не '
+            'дольше LOCAL_CACHE_TIMEOUT: сброс версии в другом процессе '
+            'этот процесс не видит.'
+        )
+
+    def test_07_etag(self, client, admin_client, titles):
+        from reviews.models import Genre
+
+        _, _, genres = titles
+        params = {'fields': 'id,name', 'facets': 'genre'}
+        etag = client.get(URL, data=params)['ETag']
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        genre.name = 'Хоррор'
+        genre.save()
+        response = client.get(URL, data=params, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что переименование жанра меняет ETag списка с '
+            '`?facets=genre`, даже если жанров нет в `fields`.'
+        )
+        assert 'Хоррор' in counts(response.json()['facets']['genre'], 'name')
+
+        etag = response['ETag']
+        admin_client.delete(f'/api/v1/genres/{genres[1]["slug"]}/')
+        response = client.get(URL, data=params, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление жанра меняет ETag списка с '
+            '`?facets=genre`.'
+        )
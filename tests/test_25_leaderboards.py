@@ -0,0 +1,137 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import check_max_queries, create_titles
+
+URL = '/api/v1/leaderboards/'
+
+
+def post_review(client, title_id, score):
+    response = client.post(
+        f'/api/v1/titles/{title_id}/reviews/',
+        data={'text': 'Отзыв', 'score': score}
+    )
+    assert response.status_code == HTTPStatus.CREATED
+
+
+def board(client, name, **params):
+    response = client.get(f'{URL}{name}/', data=params)
+    assert response.status_code == HTTPStatus.OK
+    return [obj['id'] for obj in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Leaderboards:
+
+    @pytest.fixture
+    def titles(self, settings, admin_client, user_client,
+               moderator_client):
+        settings.LEADERBOARD_MIN_REVIEWS = 2
+        created, categories, genres = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[1]['slug'],
+            'description': 'Космос',
+        })
+        first, second = created[0]['id'], created[1]['id']
+        third = response.json()['id']
+        post_review(admin_client, first, 10)
+        post_review(user_client, first, 8)
+        for client in (admin_client, user_client, moderator_client):
+            post_review(client, second, 6)
+        post_review(admin_client, third, 10)
+        call_command('refreshleaderboards', '--once', stdout=StringIO())
+        return (first, second, third), categories, genres
+
+    def test_01_boards(self, client, titles):
+        (first, second, third), _, _ = titles
+        assert board(client, 'top-rated') == [first, second], (
+            'Проверьте, что в рейтинг лучших попадают только произведения '
+            'с достаточным числом отзывов, по убыванию оценки.'
+        )
+        assert board(client, 'most-reviewed') == [second, first, third], (
+            'Проверьте, что рейтинг самых обсуждаемых упорядочен по '
+            'количеству отзывов.'
+        )
+        response = client.get(f'{URL}top-rated/')
+        data = response.json()
+        assert data['refreshed']
+        assert data['results'][0] == {
+            'position': 1,
+            'id': first,
+            'name': 'Терминатор',
+            'year': 1984,
+            'rating': 9,
+            'reviews_count': 2,
+        }
+        assert board(client, 'most-reviewed', limit=1) == [second]
+
+    def test_02_scopes(self, client, titles):
+        (first, second, third), categories, genres = titles
+        assert board(
+            client, 'most-reviewed', genre=genres[0]['slug']
+        ) == [first, third], (
+            'Проверьте, что параметр `genre` возвращает рейтинг внутри жанра.'
+        )
+        assert board(
+            client, 'most-reviewed', category=categories[1]['slug']
+        ) == [second, third], (
+            'Проверьте, что параметр `category` возвращает рейтинг внутри '
+            'категории.'
+        )
+        assert board(client, 'top-rated', genre=genres[1]['slug']) == [
+            first
+        ]
+
+    def test_03_single_query(self, client, titles):
+        _, _, genres = titles
+        check_max_queries(client, f'{URL}top-rated/', 1)
+        check_max_queries(
+            client, f'{URL}most-reviewed/?genre={genres[0]["slug"]}', 1
+        )
+
+    def test_04_refresh(self, client, moderator_client, titles):
+        (first, second, third), _, _ = titles
+        post_review(moderator_client, third, 10)
+        assert board(client, 'top-rated') == [first, second], (
+            'Проверьте, что рейтинги читаются из сохранённых строк.'
+        )
+        call_command('refreshleaderboards', '--once', stdout=StringIO())
+        assert board(client, 'top-rated') == [third, first, second], (
+            'Проверьте, что команда refreshleaderboards пересчитывает '
+            'рейтинги.'
+        )
+
+    def test_05_errors(self, client, titles):
+        _, categories, genres = titles
+        assert client.get(f'{URL}worst/').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        assert client.get(
+            f'{URL}top-rated/', data={'genre': 'unknown'}
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для несуществующего жанра возвращается 404.'
+        )
+        response = client.get(f'{URL}top-rated/', data={
+            'genre': genres[0]['slug'], 'category': categories[0]['slug']
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(f'{URL}top-rated/', data={'limit': 'x'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_positions_after_delete(self, client, admin_client, titles):
+        (first, second, _), _, _ = titles
+        admin_client.delete(f'/api/v1/titles/{first}/')
+        response = client.get(f'{URL}top-rated/')
+        assert [
+            (obj['position'], obj['id'])
+            for obj in response.json()['results']
+        ] == [(1, second)], (
+            'Проверьте, что места в рейтинге идут без пропусков после '
+            'удаления произведения.'
+        )
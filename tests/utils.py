@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +308,21 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def check_max_queries(client, url, max_queries, method='get', data=None,
+                      expected_status=HTTPStatus.OK):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data)
+    request_method = method.upper()
+    assert response.status_code == expected_status, (
+        f'Проверьте, что {request_method}-запрос к `{url}` возвращает ответ '
+        f'со статусом {expected_status}.'
+    )
+    queries = len(context.captured_queries)
+    assert queries <= max_queries, (
+        f'Проверьте, что {request_method}-запрос к `{url}` выполняет не '
+        f'больше {max_queries} запросов к базе данных. Сейчас выполняется '
+        f'{queries}.'
+    )
+    return response